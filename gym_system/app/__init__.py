@@ -1,3 +1,5 @@
+import importlib
+
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
@@ -17,9 +19,45 @@ login_manager.login_view = 'auth.login'
 login_manager.login_message = 'يرجى تسجيل الدخول للوصول لهذه الصفحة'
 login_manager.login_message_category = 'warning'
 
+# Blueprints: (module in app.routes exposing <module>_bp, url_prefix)
+# Prefix None means the blueprint defines its own url_prefix (or none)
+_BLUEPRINTS = (
+    ('auth', '/auth'),
+    ('dashboard', None),
+    ('admin', '/admin'),
+    ('members', '/members'),
+    ('subscriptions', '/subscriptions'),
+    ('attendance', '/attendance'),
+    ('finance', '/finance'),
+    ('reports', '/reports'),
+    ('api', '/api'),
+    ('bridge', '/bridge'),
+    ('health', None),
+    ('complaints', None),
+    ('classes', None),
+    ('daily_closing', None),
+    ('gift_cards', None),
+    ('offers', None),
+    ('employees', None),
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Enable WAL so SQLite readers don't block on the single writer"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA mmap_size=268435456')
+    cursor.close()
+
 
 def create_app(config_name=None):
-    """Application factory"""
+    """Application factory
+
+    Database pool size can be tuned in production with the DB_POOL_SIZE and
+    DB_MAX_OVERFLOW environment variables (see ProductionConfig).
+    """
     import os
     if config_name is None:
         config_name = os.environ.get('FLASK_ENV', 'development')
@@ -33,49 +71,22 @@ def create_app(config_name=None):
     migrate.init_app(app, db)
     csrf.init_app(app)
 
-    # Create upload folders if they don't exist
-    upload_folders = ['logos', 'members', 'receipts']
-    for folder in upload_folders:
-        folder_path = os.path.join(app.config['UPLOAD_FOLDER'], folder)
-        os.makedirs(folder_path, exist_ok=True)
+    # SQLite file databases (dev / small deployments) get WAL journaling.
+    # Sessions stay per request via Flask-SQLAlchemy's app-context scoping.
+    with app.app_context():
+        engine = db.engine
+        if engine.dialect.name == 'sqlite' and engine.url.database not in (None, '', ':memory:'):
+            from sqlalchemy import event
+            event.listen(engine, 'connect', _set_sqlite_pragmas)
 
     # Register blueprints
-    from .routes.auth import auth_bp
-    from .routes.dashboard import dashboard_bp
-    from .routes.admin import admin_bp
-    from .routes.members import members_bp
-    from .routes.subscriptions import subscriptions_bp
-    from .routes.attendance import attendance_bp
-    from .routes.finance import finance_bp
-    from .routes.reports import reports_bp
-    from .routes.api import api_bp
-    from .routes.bridge import bridge_bp
-    from .routes.health import health_bp
-    from .routes.complaints import complaints_bp
-    from .routes.classes import classes_bp
-    from .routes.daily_closing import daily_closing_bp
-    from .routes.gift_cards import gift_cards_bp
-    from .routes.offers import offers_bp
-    from .routes.employees import employees_bp
-
-    app.register_blueprint(auth_bp, url_prefix='/auth')
-    app.register_blueprint(dashboard_bp)
-    app.register_blueprint(admin_bp, url_prefix='/admin')
-    app.register_blueprint(members_bp, url_prefix='/members')
-    app.register_blueprint(subscriptions_bp, url_prefix='/subscriptions')
-    app.register_blueprint(attendance_bp, url_prefix='/attendance')
-    app.register_blueprint(finance_bp, url_prefix='/finance')
-    app.register_blueprint(reports_bp, url_prefix='/reports')
-    app.register_blueprint(api_bp, url_prefix='/api')
-    app.register_blueprint(bridge_bp, url_prefix='/bridge')
-    app.register_blueprint(health_bp)
-    app.register_blueprint(complaints_bp)
-    app.register_blueprint(classes_bp)
-    app.register_blueprint(daily_closing_bp)
-    app.register_blueprint(gift_cards_bp)
-    app.register_blueprint(offers_bp)
-    app.register_blueprint(employees_bp)
-    csrf.exempt(api_bp)  # API uses API key auth, not CSRF
+    for module_name, url_prefix in _BLUEPRINTS:
+        module = importlib.import_module(f'.routes.{module_name}', __name__)
+        bp = getattr(module, f'{module_name}_bp')
+        kwargs = {'url_prefix': url_prefix} if url_prefix else {}
+        app.register_blueprint(bp, **kwargs)
+        if module_name == 'api':
+            csrf.exempt(bp)  # API uses API key auth, not CSRF
 
     # Register error handlers
     register_error_handlers(app)
@@ -83,17 +94,6 @@ def create_app(config_name=None):
     # Register CLI commands
     register_cli_commands(app)
 
-    # Context processors
-    @app.context_processor
-    def inject_globals():
-        try:
-            from .models.user import Role
-            return {
-                'roles': Role.query.all() if Role.query.first() else []
-            }
-        except Exception:
-            return {'roles': []}
-
     return app
 
 
@@ -134,19 +134,18 @@ def register_cli_commands(app):
             click.echo('Owner already exists!')
             return
 
+        if not owner_role:
+            click.echo('Please run db upgrade first to create roles')
+            return
+
         # Create default company if not exists
         company = Company.query.first()
         if not company:
             company = Company(name='الشركة الرئيسية')
             db.session.add(company)
-            db.session.commit()
             click.echo(f'Created company: {company.name}')
 
-        # Create owner
-        if not owner_role:
-            click.echo('Please run db upgrade first to create roles')
-            return
-
+        # Create owner (committed together with the company)
         user = User(
             name=name,
             email=email,
@@ -159,6 +158,17 @@ def register_cli_commands(app):
 
         click.echo(f'Created admin user: {email}')
 
+    @app.cli.command('init-storage')
+    def init_storage():
+        """Create upload folders (run once at deploy time)"""
+        import os
+
+        # save_uploaded_file() also creates its folder on demand
+        for folder in ['logos', 'members', 'receipts']:
+            folder_path = os.path.join(app.config['UPLOAD_FOLDER'], folder)
+            os.makedirs(folder_path, exist_ok=True)
+            click.echo(f'Ready: {folder_path}')
+
     @app.cli.command('init-db')
     def init_db():
         """Initialize database with default data"""
@@ -190,15 +200,41 @@ def register_cli_commands(app):
             }),
         ]
 
+        # Look up all existing roles in one query
+        existing = {
+            row.name_en for row in Role.query.with_entities(Role.name_en).filter(
+                Role.name_en.in_([r[0] for r in roles_data])
+            )
+        }
+
+        new_roles = []
         for name_en, name_ar, description, permissions in roles_data:
-            if not Role.query.filter_by(name_en=name_en).first():
-                role = Role(name=name_ar, name_en=name_en, description=description, **permissions)
-                db.session.add(role)
+            if name_en not in existing:
+                new_roles.append(Role(name=name_ar, name_en=name_en, description=description, **permissions))
                 click.echo(f'Created role: {name_ar}')
 
+        db.session.bulk_save_objects(new_roles)
         db.session.commit()
         click.echo('Database initialized successfully!')
 
+    @app.cli.command('purge-device-commands')
+    @click.option('--days', default=30, show_default=True, help='Keep commands executed within this many days')
+    def purge_device_commands(days):
+        """Delete old completed/failed device commands (run from a scheduled job)"""
+        from .models.fingerprint import DeviceCommand
+
+        deleted = DeviceCommand.purge_executed(days)
+        click.echo(f'Deleted {deleted} executed device commands')
+
+    @app.cli.command('expire-subscriptions')
+    @click.option('--brand-id', type=int, help='Only expire subscriptions of this brand')
+    def expire_subscriptions(brand_id):
+        """Mark overdue active subscriptions as expired (run from a scheduled job)"""
+        from .models.subscription import Subscription
+
+        expired = Subscription.expire_overdue(brand_id)
+        click.echo(f'Expired {expired} subscriptions')
+
     @app.cli.command('seed-data')
     @click.option('--brand-id', type=int, help='Brand ID to seed data for')
     def seed_data(brand_id):
@@ -228,21 +264,25 @@ def register_cli_commands(app):
                 {'name': 'صالون', 'name_en': 'salon', 'category': 'salon', 'requires_class_booking': True},
             ]
 
+            existing = {
+                row.name_en for row in ServiceType.query.with_entities(ServiceType.name_en).filter(
+                    ServiceType.brand_id == brand_id,
+                    ServiceType.name_en.in_([s['name_en'] for s in default_services])
+                )
+            }
+
+            new_services = []
             for service_data in default_services:
-                existing = ServiceType.query.filter_by(
-                    brand_id=brand_id,
-                    name_en=service_data.get('name_en')
-                ).first()
-                if not existing:
-                    service = ServiceType(
+                if service_data.get('name_en') not in existing:
+                    new_services.append(ServiceType(
                         brand_id=brand_id,
                         name=service_data['name'],
                         name_en=service_data.get('name_en'),
                         category=service_data['category'],
                         requires_class_booking=service_data.get('requires_class_booking', False)
-                    )
-                    db.session.add(service)
+                    ))
                     click.echo(f'  Created: {service_data["name"]}')
 
+            db.session.bulk_save_objects(new_services)
             db.session.commit()
             click.echo('Done!')
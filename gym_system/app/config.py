@@ -21,6 +21,9 @@ class Config:
     # Session
     PERMANENT_SESSION_LIFETIME = timedelta(hours=12)
 
+    # CSRF tokens live as long as the session instead of being re-signed hourly
+    WTF_CSRF_TIME_LIMIT = None
+
     # Fingerprint API
     FINGERPRINT_API_KEY = os.environ.get('FINGERPRINT_API_KEY') or 'fingerprint-api-key'
 
@@ -31,6 +34,7 @@ class Config:
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
+    WTF_CSRF_SSL_STRICT = False
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'sqlite:///' + os.path.join(basedir, '..', 'instance', 'gym_system.db')
 
@@ -38,6 +42,8 @@ class DevelopmentConfig(Config):
 class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
+    SQLALCHEMY_ECHO = False
+    SQLALCHEMY_RECORD_QUERIES = False  # Only needed by debug tooling
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'sqlite:///' + os.path.join(basedir, '..', 'instance', 'gym_system.db')
 
@@ -45,6 +51,17 @@ class ProductionConfig(Config):
     if SQLALCHEMY_DATABASE_URI and SQLALCHEMY_DATABASE_URI.startswith('postgres://'):
         SQLALCHEMY_DATABASE_URI = SQLALCHEMY_DATABASE_URI.replace('postgres://', 'postgresql://', 1)
 
+    # Connection pool for PostgreSQL (SQLite keeps SQLAlchemy's default pool)
+    # Tune with DB_POOL_SIZE / DB_MAX_OVERFLOW env vars
+    if SQLALCHEMY_DATABASE_URI.startswith('postgresql://'):
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', 20)),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 30)),
+            'pool_pre_ping': True,
+            'pool_recycle': 1800,
+            'pool_timeout': 30,
+        }
+
 
 class TestingConfig(Config):
     """Testing configuration"""
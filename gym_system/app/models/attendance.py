@@ -1,4 +1,4 @@
-from datetime import datetime, date
+from datetime import datetime, date, time, timedelta
 from app import db
 
 
@@ -46,32 +46,33 @@ class MemberAttendance(db.Model):
         """Check-in time formatted"""
         return self.check_in.strftime('%H:%M')
 
+    SOURCE_TEXT = {
+        'manual': 'يدوي',
+        'qr': 'QR',
+        'fingerprint': 'بصمة'
+    }
+
     @property
     def source_text(self):
         """Source in Arabic"""
-        source_map = {
-            'manual': 'يدوي',
-            'qr': 'QR',
-            'fingerprint': 'بصمة'
-        }
-        return source_map.get(self.source, self.source)
+        return self.SOURCE_TEXT.get(self.source, self.source)
 
     @classmethod
     def get_today_count(cls, brand_id):
         """Get today's attendance count for brand"""
-        today = date.today()
-        return cls.query.filter(
-            cls.brand_id == brand_id,
-            db.func.date(cls.check_in) == today
-        ).count()
+        return cls.get_date_range_count(brand_id, date.today(), date.today())
 
     @classmethod
     def get_date_range_count(cls, brand_id, start_date, end_date):
         """Get attendance count for date range"""
+        # Compare check_in against a half-open datetime range instead of
+        # wrapping it in DATE() so idx_member_attendance_date can be used
+        start_dt = datetime.combine(start_date, time.min)
+        end_dt = datetime.combine(end_date + timedelta(days=1), time.min)
         return cls.query.filter(
             cls.brand_id == brand_id,
-            db.func.date(cls.check_in) >= start_date,
-            db.func.date(cls.check_in) <= end_date
+            cls.check_in >= start_dt,
+            cls.check_in < end_dt
         ).count()
 
 
@@ -113,46 +114,53 @@ class EmployeeAttendance(db.Model):
     def __repr__(self):
         return f'<EmployeeAttendance {self.user_id} - {self.date}>'
 
+    STATUS_TEXT = {
+        'present': 'حاضر',
+        'absent': 'غائب',
+        'late': 'متأخر',
+        'leave': 'إجازة'
+    }
+
     @property
     def status_text(self):
         """Status in Arabic"""
-        status_map = {
-            'present': 'حاضر',
-            'absent': 'غائب',
-            'late': 'متأخر',
-            'leave': 'إجازة'
-        }
-        return status_map.get(self.status, self.status)
+        return self.STATUS_TEXT.get(self.status, self.status)
+
+    STATUS_CLASS = {
+        'present': 'success',
+        'absent': 'danger',
+        'late': 'warning',
+        'leave': 'info'
+    }
 
     @property
     def status_class(self):
         """CSS class for status"""
-        class_map = {
-            'present': 'success',
-            'absent': 'danger',
-            'late': 'warning',
-            'leave': 'info'
-        }
-        return class_map.get(self.status, 'secondary')
+        return self.STATUS_CLASS.get(self.status, 'secondary')
+
+    SOURCE_TEXT = {
+        'manual': 'يدوي',
+        'fingerprint': 'بصمة'
+    }
 
     @property
     def source_text(self):
         """Source in Arabic"""
-        source_map = {
-            'manual': 'يدوي',
-            'fingerprint': 'بصمة'
-        }
-        return source_map.get(self.source, self.source)
+        return self.SOURCE_TEXT.get(self.source, self.source)
+
+    @property
+    def working_minutes(self):
+        """Minutes between check-in and check-out (wraps past midnight)"""
+        if self.check_in and self.check_out:
+            check_in_secs = self.check_in.hour * 3600 + self.check_in.minute * 60 + self.check_in.second
+            check_out_secs = self.check_out.hour * 3600 + self.check_out.minute * 60 + self.check_out.second
+            return ((check_out_secs - check_in_secs) % 86400) // 60
+        return None
 
     @property
     def working_hours(self):
         """Calculate working hours"""
-        if self.check_in and self.check_out:
-            from datetime import datetime, timedelta
-            check_in_dt = datetime.combine(self.date, self.check_in)
-            check_out_dt = datetime.combine(self.date, self.check_out)
-            diff = check_out_dt - check_in_dt
-            hours = diff.seconds // 3600
-            minutes = (diff.seconds % 3600) // 60
-            return f'{hours}:{minutes:02d}'
-        return '-'
+        minutes = self.working_minutes
+        if minutes is None:
+            return '-'
+        return f'{minutes // 60}:{minutes % 60:02d}'
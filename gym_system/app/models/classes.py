@@ -1,5 +1,6 @@
 from datetime import datetime, date, time, timedelta
 from app import db
+from sqlalchemy.exc import IntegrityError
 
 
 class GymClass(db.Model):
@@ -32,18 +33,19 @@ class GymClass(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     # Relationships
-    bookings = db.relationship('ClassBooking', backref='gym_class', lazy='dynamic')
+    bookings = db.relationship('ClassBooking', backref='gym_class')
     trainer = db.relationship('User', backref='classes_taught')
 
     def __repr__(self):
         return f'<GymClass {self.name}>'
 
+    DAY_NAMES_ARABIC = ('السبت', 'الأحد', 'الاثنين', 'الثلاثاء', 'الأربعاء', 'الخميس', 'الجمعة')
+
     @property
     def day_name_arabic(self):
         """Get day name in Arabic"""
-        days = ['السبت', 'الأحد', 'الاثنين', 'الثلاثاء', 'الأربعاء', 'الخميس', 'الجمعة']
         if self.day_of_week is not None and 0 <= self.day_of_week <= 6:
-            return days[self.day_of_week]
+            return self.DAY_NAMES_ARABIC[self.day_of_week]
         return 'غير محدد'
 
     @property
@@ -62,13 +64,21 @@ class GymClass(db.Model):
             return int((end - start).total_seconds() / 60)
         return 0
 
+    @property
+    def bookings_count(self):
+        """Count of all bookings for this class"""
+        return db.session.query(db.func.count(ClassBooking.id)).filter(
+            ClassBooking.class_id == self.id
+        ).scalar()
+
     def get_bookings_for_date(self, booking_date):
         """Get all bookings for a specific date"""
-        return self.bookings.filter_by(booking_date=booking_date).all()
+        return ClassBooking.query.filter_by(class_id=self.id, booking_date=booking_date).all()
 
     def get_available_spots(self, booking_date):
         """Get available spots for a specific date"""
-        booked = self.bookings.filter(
+        booked = ClassBooking.query.filter(
+            ClassBooking.class_id == self.id,
             ClassBooking.booking_date == booking_date,
             ClassBooking.status.in_(['booked', 'attended'])
         ).count()
@@ -80,17 +90,22 @@ class GymClass(db.Model):
 
     def can_book(self, member_id, booking_date):
         """Check if a member can book this class"""
-        # Check if already booked
-        existing = self.bookings.filter(
-            ClassBooking.member_id == member_id,
+        # One round-trip for both the duplicate check and the capacity check
+        existing, booked = db.session.query(
+            db.func.coalesce(db.func.sum(db.case((ClassBooking.member_id == member_id, 1), else_=0)), 0),
+            db.func.count(ClassBooking.id)
+        ).filter(
+            ClassBooking.class_id == self.id,
             ClassBooking.booking_date == booking_date,
             ClassBooking.status.in_(['booked', 'attended'])
-        ).first()
+        ).one()
+
+        # Check if already booked
         if existing:
             return False, 'العضو مسجل بالفعل في هذا الكلاس'
 
         # Check capacity
-        if self.is_full(booking_date):
+        if booked >= self.capacity:
             return False, 'الكلاس ممتلئ'
 
         return True, 'يمكن الحجز'
@@ -142,55 +157,66 @@ class ClassBooking(db.Model):
     cancelled_at = db.Column(db.DateTime)
 
     # Relationships
-    member = db.relationship('Member', backref=db.backref('class_bookings', lazy='dynamic'))
+    member = db.relationship('Member', backref='class_bookings')
+
+    # Indexes for faster queries; a member holds at most one active booking
+    # per class and day (cancelled/no-show rows do not block rebooking)
+    __table_args__ = (
+        db.Index('idx_booking_class_date_status', 'class_id', 'booking_date', 'status'),
+        db.Index('idx_booking_member_date', 'member_id', 'booking_date'),
+        db.Index('unique_active_booking', 'class_id', 'member_id', 'booking_date', unique=True,
+                 postgresql_where=db.text("status IN ('booked', 'attended')"),
+                 sqlite_where=db.text("status IN ('booked', 'attended')")),
+    )
 
     def __repr__(self):
         return f'<ClassBooking {self.id} for Class {self.class_id}>'
 
+    STATUS_ARABIC = {
+        'booked': 'محجوز',
+        'attended': 'حضر',
+        'cancelled': 'ملغي',
+        'no_show': 'لم يحضر'
+    }
+
     @property
     def status_arabic(self):
         """Get status in Arabic"""
-        status_map = {
-            'booked': 'محجوز',
-            'attended': 'حضر',
-            'cancelled': 'ملغي',
-            'no_show': 'لم يحضر'
-        }
-        return status_map.get(self.status, self.status)
+        return self.STATUS_ARABIC.get(self.status, self.status)
+
+    STATUS_CLASS = {
+        'booked': 'info',
+        'attended': 'success',
+        'cancelled': 'secondary',
+        'no_show': 'danger'
+    }
 
     @property
     def status_class(self):
         """Get CSS class for status"""
-        status_classes = {
-            'booked': 'info',
-            'attended': 'success',
-            'cancelled': 'secondary',
-            'no_show': 'danger'
-        }
-        return status_classes.get(self.status, 'secondary')
+        return self.STATUS_CLASS.get(self.status, 'secondary')
 
     def check_in(self, checked_in_by_user_id=None):
         """Mark booking as attended"""
         self.status = 'attended'
         self.check_in_time = datetime.utcnow()
         self.checked_in_by = checked_in_by_user_id
-        db.session.commit()
 
     def cancel(self):
         """Cancel the booking"""
         self.status = 'cancelled'
         self.cancelled_at = datetime.utcnow()
-        db.session.commit()
 
     def mark_no_show(self):
         """Mark as no-show"""
         self.status = 'no_show'
-        db.session.commit()
 
     @classmethod
     def book_class(cls, class_id, member_id, booking_date, subscription_id=None):
         """Create a new class booking"""
-        gym_class = GymClass.query.get(class_id)
+        # Lock the class row so concurrent bookings cannot both pass the
+        # capacity check (FOR UPDATE is ignored on SQLite)
+        gym_class = GymClass.query.filter_by(id=class_id).with_for_update().first()
         if not gym_class:
             return None, 'الكلاس غير موجود'
 
@@ -205,7 +231,12 @@ class ClassBooking(db.Model):
             subscription_id=subscription_id
         )
         db.session.add(booking)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another request booked the same member in the meantime
+            db.session.rollback()
+            return None, 'العضو مسجل بالفعل في هذا الكلاس'
         return booking, 'تم الحجز بنجاح'
 
     @classmethod
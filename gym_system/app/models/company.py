@@ -12,7 +12,7 @@ class Company(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     # Relationships
-    brands = db.relationship('Brand', backref='company', lazy='dynamic')
+    brands = db.relationship('Brand', backref='company')
 
     def __repr__(self):
         return f'<Company {self.name}>'
@@ -36,24 +36,40 @@ class Brand(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     # Relationships
-    branches = db.relationship('Branch', backref='brand', lazy='dynamic')
-    users = db.relationship('User', backref='brand', lazy='dynamic')
-    members = db.relationship('Member', backref='brand', lazy='dynamic')
-    plans = db.relationship('Plan', backref='brand', lazy='dynamic')
-    subscriptions = db.relationship('Subscription', backref='brand', lazy='dynamic')
+    branches = db.relationship('Branch', backref='brand')
+    users = db.relationship('User', backref='brand')
+    members = db.relationship('Member', backref='brand')
+    plans = db.relationship('Plan', backref='brand')
+    subscriptions = db.relationship('Subscription', backref='brand')
 
     def __repr__(self):
         return f'<Brand {self.name}>'
 
+    @property
+    def members_count(self):
+        """Count of all members"""
+        from app.models.member import Member
+        return db.session.query(db.func.count(Member.id)).filter(
+            Member.brand_id == self.id
+        ).scalar()
+
     @property
     def active_members_count(self):
         """Count of active members"""
-        return self.members.filter_by(is_active=True).count()
+        from app.models.member import Member
+        return db.session.query(db.func.count(Member.id)).filter(
+            Member.brand_id == self.id,
+            Member.is_active == True
+        ).scalar()
 
     @property
     def active_subscriptions_count(self):
         """Count of active subscriptions"""
-        return self.subscriptions.filter_by(status='active').count()
+        from app.models.subscription import Subscription
+        return db.session.query(db.func.count(Subscription.id)).filter(
+            Subscription.brand_id == self.id,
+            Subscription.status == 'active'
+        ).scalar()
 
 
 class Branch(db.Model):
@@ -79,8 +95,8 @@ class Branch(db.Model):
     commercial_registration_expiry = db.Column(db.Date)
 
     # Relationships
-    users = db.relationship('User', backref='branch', lazy='dynamic')
-    members = db.relationship('Member', backref='branch', lazy='dynamic')
+    users = db.relationship('User', backref='branch')
+    members = db.relationship('Member', backref='branch')
 
     def __repr__(self):
         return f'<Branch {self.name}>'
@@ -125,30 +141,34 @@ class Branch(db.Model):
             return (self.commercial_registration_expiry - date.today()).days
         return None
 
+    def _adjust_occupancy(self, column, delta, capacity):
+        """Atomically add delta to an occupancy counter within its bounds"""
+        # A single UPDATE avoids lost increments under concurrent swipes;
+        # the bounds are enforced in the WHERE clause (no capacity means no limit)
+        current = db.func.coalesce(column, 0)
+        bound = db.or_(capacity.is_(None), current < capacity) if delta > 0 else current > 0
+        result = db.session.execute(
+            db.update(Branch).where(Branch.id == self.id, bound).values({column: current + delta})
+        )
+        return result.rowcount > 0
+
     def check_in_gym(self):
         """Increment gym occupancy"""
-        self.current_gym_occupancy = (self.current_gym_occupancy or 0) + 1
-        db.session.commit()
+        return self._adjust_occupancy(Branch.current_gym_occupancy, 1, Branch.gym_capacity)
 
     def check_out_gym(self):
         """Decrement gym occupancy"""
-        if self.current_gym_occupancy and self.current_gym_occupancy > 0:
-            self.current_gym_occupancy -= 1
-            db.session.commit()
+        return self._adjust_occupancy(Branch.current_gym_occupancy, -1, Branch.gym_capacity)
 
     def check_in_pool(self):
         """Increment pool occupancy"""
-        self.current_pool_occupancy = (self.current_pool_occupancy or 0) + 1
-        db.session.commit()
+        return self._adjust_occupancy(Branch.current_pool_occupancy, 1, Branch.pool_capacity)
 
     def check_out_pool(self):
         """Decrement pool occupancy"""
-        if self.current_pool_occupancy and self.current_pool_occupancy > 0:
-            self.current_pool_occupancy -= 1
-            db.session.commit()
+        return self._adjust_occupancy(Branch.current_pool_occupancy, -1, Branch.pool_capacity)
 
     def reset_occupancy(self):
         """Reset all occupancy counts (for end of day)"""
         self.current_gym_occupancy = 0
         self.current_pool_occupancy = 0
-        db.session.commit()
@@ -14,11 +14,18 @@ class ComplaintCategory(db.Model):
     is_active = db.Column(db.Boolean, default=True)
 
     # Relationships
-    complaints = db.relationship('Complaint', backref='category', lazy='dynamic')
+    complaints = db.relationship('Complaint', backref='category')
 
     def __repr__(self):
         return f'<ComplaintCategory {self.name}>'
 
+    @property
+    def complaints_count(self):
+        """Count of complaints in this category"""
+        return db.session.query(db.func.count(Complaint.id)).filter(
+            Complaint.category_id == self.id
+        ).scalar()
+
     @classmethod
     def get_default_categories(cls):
         """Get default complaint categories"""
@@ -32,11 +39,14 @@ class ComplaintCategory(db.Model):
     @classmethod
     def seed_defaults(cls):
         """Seed default complaint categories"""
-        for cat_data in cls.get_default_categories():
-            existing = cls.query.filter_by(name_en=cat_data['name_en']).first()
-            if not existing:
-                category = cls(**cat_data)
-                db.session.add(category)
+        defaults = cls.get_default_categories()
+        # Look up all existing categories in one query
+        existing = {
+            row.name_en for row in cls.query.with_entities(cls.name_en).filter(
+                cls.name_en.in_([c['name_en'] for c in defaults])
+            )
+        }
+        db.session.bulk_save_objects([cls(**c) for c in defaults if c['name_en'] not in existing])
         db.session.commit()
 
 
@@ -51,7 +61,7 @@ class Complaint(db.Model):
     category_id = db.Column(db.Integer, db.ForeignKey('complaint_categories.id'))
 
     # Public submission token for tracking
-    tracking_token = db.Column(db.String(32), unique=True)
+    tracking_token = db.Column(db.String(32), unique=True, default=lambda: secrets.token_hex(16))
 
     # Customer info (for anonymous complaints)
     customer_name = db.Column(db.String(100))
@@ -81,61 +91,66 @@ class Complaint(db.Model):
     resolved_by = db.Column(db.Integer, db.ForeignKey('users.id'))  # Who resolved it
 
     # Relationships
+    member = db.relationship('Member')
     creator = db.relationship('User', foreign_keys=[created_by], backref='complaints_created')
     assignee = db.relationship('User', foreign_keys=[assigned_to], backref='complaints_assigned')
     resolver = db.relationship('User', foreign_keys=[resolved_by], backref='complaints_resolved')
 
+    # Indexes for faster queries
+    __table_args__ = (
+        db.Index('idx_complaints_open', 'brand_id', 'status', 'created_at'),
+    )
+
     def __repr__(self):
         return f'<Complaint {self.id}: {self.subject[:30]}>'
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        if not self.tracking_token:
-            self.tracking_token = secrets.token_hex(16)
+    STATUS_ARABIC = {
+        'pending': 'قيد الانتظار',
+        'in_progress': 'قيد المعالجة',
+        'resolved': 'تم الحل',
+        'closed': 'مغلق'
+    }
 
     @property
     def status_arabic(self):
         """Get status in Arabic"""
-        status_map = {
-            'pending': 'قيد الانتظار',
-            'in_progress': 'قيد المعالجة',
-            'resolved': 'تم الحل',
-            'closed': 'مغلق'
-        }
-        return status_map.get(self.status, self.status)
+        return self.STATUS_ARABIC.get(self.status, self.status)
+
+    STATUS_CLASS = {
+        'pending': 'warning',
+        'in_progress': 'info',
+        'resolved': 'success',
+        'closed': 'secondary'
+    }
 
     @property
     def status_class(self):
         """Get CSS class for status"""
-        status_classes = {
-            'pending': 'warning',
-            'in_progress': 'info',
-            'resolved': 'success',
-            'closed': 'secondary'
-        }
-        return status_classes.get(self.status, 'secondary')
+        return self.STATUS_CLASS.get(self.status, 'secondary')
+
+    PRIORITY_ARABIC = {
+        'low': 'منخفضة',
+        'normal': 'عادية',
+        'high': 'عالية',
+        'urgent': 'عاجلة'
+    }
 
     @property
     def priority_arabic(self):
         """Get priority in Arabic"""
-        priority_map = {
-            'low': 'منخفضة',
-            'normal': 'عادية',
-            'high': 'عالية',
-            'urgent': 'عاجلة'
-        }
-        return priority_map.get(self.priority, self.priority)
+        return self.PRIORITY_ARABIC.get(self.priority, self.priority)
+
+    PRIORITY_CLASS = {
+        'low': 'info',
+        'normal': 'secondary',
+        'high': 'warning',
+        'urgent': 'danger'
+    }
 
     @property
     def priority_class(self):
         """Get CSS class for priority"""
-        priority_classes = {
-            'low': 'info',
-            'normal': 'secondary',
-            'high': 'warning',
-            'urgent': 'danger'
-        }
-        return priority_classes.get(self.priority, 'secondary')
+        return self.PRIORITY_CLASS.get(self.priority, 'secondary')
 
     @property
     def customer_display_name(self):
@@ -150,22 +165,32 @@ class Complaint(db.Model):
         self.resolution = resolution_text
         self.resolved_at = datetime.utcnow()
         self.resolved_by = resolved_by_user_id
-        db.session.commit()
 
     def close(self):
         """Close the complaint"""
         self.status = 'closed'
-        db.session.commit()
 
     @classmethod
-    def get_open_complaints(cls, brand_id=None, branch_id=None):
-        """Get all open (non-closed) complaints"""
-        query = cls.query.filter(cls.status.in_(['pending', 'in_progress']))
+    def keyset_page(cls, query, before_id=None, limit=None):
+        """Order a complaints query newest first and return the page after before_id"""
+        # The (created_at, id) cursor is resolved in SQL, so callers only pass an id
+        if before_id:
+            cursor_created_at = db.select(cls.created_at).where(cls.id == before_id).scalar_subquery()
+            query = query.filter(db.tuple_(cls.created_at, cls.id) < db.tuple_(cursor_created_at, before_id))
+        query = query.order_by(cls.created_at.desc(), cls.id.desc())
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+
+    @classmethod
+    def get_open_complaints(cls, brand_id=None, branch_id=None, before_id=None, limit=None):
+        """Get open (non-closed) complaints, newest first"""
+        query = cls.query.options(db.joinedload(cls.member)).filter(cls.status.in_(['pending', 'in_progress']))
         if brand_id:
             query = query.filter_by(brand_id=brand_id)
         if branch_id:
             query = query.filter_by(branch_id=branch_id)
-        return query.order_by(cls.created_at.desc()).all()
+        return cls.keyset_page(query, before_id, limit)
 
     @classmethod
     def count_by_category(cls, brand_id=None, start_date=None, end_date=None):
@@ -1,5 +1,6 @@
-from datetime import datetime, date
+from datetime import datetime, date, time, timedelta
 from app import db
+from sqlalchemy.exc import IntegrityError
 from decimal import Decimal
 
 
@@ -55,45 +56,55 @@ class DailyClosing(db.Model):
     # Unique constraint: one closing per branch per day
     __table_args__ = (
         db.UniqueConstraint('brand_id', 'branch_id', 'closing_date', name='unique_daily_closing'),
+        # NULLs are distinct in the constraint above, so brand-wide closings need their own
+        db.Index('unique_daily_closing_brand_wide', 'brand_id', 'closing_date', unique=True,
+                 postgresql_where=db.text('branch_id IS NULL'),
+                 sqlite_where=db.text('branch_id IS NULL')),
+        db.Index('idx_daily_closing_brand_status_date', 'brand_id', 'status', 'closing_date'),
+        # Partial index: only the closings awaiting verification
+        db.Index('idx_daily_closing_submitted', 'brand_id', 'closing_date',
+                 postgresql_where=db.text("status = 'submitted'"),
+                 sqlite_where=db.text("status = 'submitted'")),
     )
 
     def __repr__(self):
         return f'<DailyClosing {self.closing_date} - Branch {self.branch_id}>'
 
+    STATUS_ARABIC = {
+        'pending': 'قيد الإعداد',
+        'submitted': 'تم التسليم',
+        'verified': 'تم التحقق',
+        'rejected': 'مرفوض'
+    }
+
     @property
     def status_arabic(self):
         """Get status in Arabic"""
-        status_map = {
-            'pending': 'قيد الإعداد',
-            'submitted': 'تم التسليم',
-            'verified': 'تم التحقق',
-            'rejected': 'مرفوض'
-        }
-        return status_map.get(self.status, self.status)
+        return self.STATUS_ARABIC.get(self.status, self.status)
+
+    STATUS_CLASS = {
+        'pending': 'warning',
+        'submitted': 'info',
+        'verified': 'success',
+        'rejected': 'danger'
+    }
 
     @property
     def status_class(self):
         """Get CSS class for status"""
-        status_classes = {
-            'pending': 'warning',
-            'submitted': 'info',
-            'verified': 'success',
-            'rejected': 'danger'
-        }
-        return status_classes.get(self.status, 'secondary')
+        return self.STATUS_CLASS.get(self.status, 'secondary')
 
     @property
     def has_cash_difference(self):
         """Check if there's a cash difference"""
-        return self.cash_difference and float(self.cash_difference) != 0
+        return bool(self.cash_difference)
 
     @property
     def cash_difference_class(self):
         """Get CSS class for cash difference"""
         if not self.has_cash_difference:
             return 'success'
-        diff = float(self.cash_difference)
-        if abs(diff) <= 10:  # Small difference
+        if abs(self.cash_difference) <= 10:  # Small difference
             return 'warning'
         return 'danger'  # Large difference
 
@@ -110,43 +121,55 @@ class DailyClosing(db.Model):
         from .finance import Income
         from .subscription import Subscription, SubscriptionPayment
 
+        # Half-open range over the closing day so the (brand_id, timestamp)
+        # indexes can be used instead of wrapping the column in DATE()
+        day_start = datetime.combine(self.closing_date, time.min)
+        day_end = day_start + timedelta(days=1)
+
         # Get subscriptions created on this date
         new_subs = Subscription.query.filter(
             Subscription.brand_id == self.brand_id,
-            db.func.date(Subscription.created_at) == self.closing_date
+            Subscription.created_at >= day_start,
+            Subscription.created_at < day_end
         )
         if self.branch_id:
             new_subs = new_subs.filter_by(branch_id=self.branch_id)
 
-        self.new_subscriptions_count = new_subs.count()
+        self.new_subscriptions_count = new_subs.with_entities(db.func.count(Subscription.id)).scalar()
 
         # Get renewals (subscriptions with same member having previous subscription)
         # This is simplified - you might want a more accurate calculation
         self.renewals_count = 0  # TODO: Implement renewal detection
 
-        # Get payments by method
-        payments = SubscriptionPayment.query.filter(
+        # Get payment totals by method in one aggregate
+        totals = dict(db.session.query(
+            SubscriptionPayment.payment_method,
+            db.func.sum(SubscriptionPayment.amount)
+        ).filter(
             SubscriptionPayment.brand_id == self.brand_id,
-            db.func.date(SubscriptionPayment.payment_date) == self.closing_date
-        )
+            SubscriptionPayment.payment_date >= day_start,
+            SubscriptionPayment.payment_date < day_end
+        ).group_by(SubscriptionPayment.payment_method).all())
 
-        self.cash_amount = sum(float(p.amount) for p in payments if p.payment_method == 'cash') or 0
-        self.card_amount = sum(float(p.amount) for p in payments if p.payment_method == 'card') or 0
-        self.transfer_amount = sum(float(p.amount) for p in payments if p.payment_method == 'transfer') or 0
+        self.cash_amount = totals.get('cash') or Decimal(0)
+        self.card_amount = totals.get('card') or Decimal(0)
+        self.transfer_amount = totals.get('transfer') or Decimal(0)
 
         self.total_sales = self.cash_amount + self.card_amount + self.transfer_amount
         self.expected_cash = self.cash_amount
 
     def submit(self, actual_cash, notes=None, explanation=None, user_id=None):
         """Submit the daily closing with actual cash count"""
-        self.actual_cash_submitted = Decimal(str(actual_cash))
-        self.cash_difference = self.actual_cash_submitted - Decimal(str(self.expected_cash or 0))
+        # Form input already arrives as Decimal; only JSON floats need converting
+        if not isinstance(actual_cash, Decimal):
+            actual_cash = Decimal(str(actual_cash))
+        self.actual_cash_submitted = actual_cash
+        self.cash_difference = actual_cash - (self.expected_cash or Decimal(0))
         self.notes = notes
         self.difference_explanation = explanation
         self.status = 'submitted'
         self.submitted_at = datetime.utcnow()
         self.submitted_by = user_id
-        db.session.commit()
 
     def verify(self, user_id, approve=True):
         """Verify/reject the daily closing"""
@@ -156,7 +179,22 @@ class DailyClosing(db.Model):
             self.status = 'rejected'
         self.verified_at = datetime.utcnow()
         self.verified_by = user_id
+
+    @classmethod
+    def bulk_verify(cls, closing_ids, user_id, approve=True):
+        """Verify/reject several submitted closings in one UPDATE"""
+        result = db.session.execute(
+            db.update(cls).where(
+                cls.id.in_(closing_ids),
+                cls.status == 'submitted'
+            ).values(
+                status='verified' if approve else 'rejected',
+                verified_at=datetime.utcnow(),
+                verified_by=user_id
+            )
+        )
         db.session.commit()
+        return result.rowcount
 
     @classmethod
     def get_or_create(cls, brand_id, closing_date, branch_id=None):
@@ -173,16 +211,27 @@ class DailyClosing(db.Model):
                 branch_id=branch_id,
                 closing_date=closing_date
             )
-            db.session.add(closing)
-            closing.calculate_from_transactions()
-            db.session.commit()
+            try:
+                with db.session.begin_nested():
+                    db.session.add(closing)
+                    closing.calculate_from_transactions()
+                db.session.commit()
+            except IntegrityError:
+                # Another request created the closing in the meantime
+                closing = cls.query.filter_by(
+                    brand_id=brand_id,
+                    branch_id=branch_id,
+                    closing_date=closing_date
+                ).one()
 
         return closing
 
     @classmethod
     def get_pending_verifications(cls, brand_id=None):
         """Get all closings pending verification"""
-        query = cls.query.filter_by(status='submitted')
+        query = cls.query.options(
+            db.selectinload(cls.submitter), db.selectinload(cls.verifier)
+        ).filter_by(status='submitted')
         if brand_id:
             query = query.filter_by(brand_id=brand_id)
         return query.order_by(cls.closing_date.desc()).all()
@@ -191,7 +240,9 @@ class DailyClosing(db.Model):
     def get_with_differences(cls, brand_id=None, min_difference=0):
         """Get closings with cash differences"""
         from sqlalchemy import func
-        query = cls.query.filter(
+        query = cls.query.options(
+            db.selectinload(cls.submitter), db.selectinload(cls.verifier)
+        ).filter(
             func.abs(cls.cash_difference) > min_difference
         )
         if brand_id:
@@ -203,23 +254,14 @@ class DailyClosing(db.Model):
         """Get summary for a date range"""
         from sqlalchemy import func
 
-        query = cls.query.filter(
-            cls.brand_id == brand_id,
-            cls.closing_date >= start_date,
-            cls.closing_date <= end_date,
-            cls.status.in_(['submitted', 'verified'])
-        )
-        if branch_id:
-            query = query.filter_by(branch_id=branch_id)
-
-        result = db.session.query(
-            func.sum(cls.total_sales),
-            func.sum(cls.cash_amount),
-            func.sum(cls.card_amount),
-            func.sum(cls.transfer_amount),
-            func.sum(cls.cash_difference),
-            func.sum(cls.new_subscriptions_count),
-            func.sum(cls.renewals_count)
+        query = db.session.query(
+            func.coalesce(func.sum(cls.total_sales), 0),
+            func.coalesce(func.sum(cls.cash_amount), 0),
+            func.coalesce(func.sum(cls.card_amount), 0),
+            func.coalesce(func.sum(cls.transfer_amount), 0),
+            func.coalesce(func.sum(cls.cash_difference), 0),
+            func.coalesce(func.sum(cls.new_subscriptions_count), 0),
+            func.coalesce(func.sum(cls.renewals_count), 0)
         ).filter(
             cls.brand_id == brand_id,
             cls.closing_date >= start_date,
@@ -227,16 +269,16 @@ class DailyClosing(db.Model):
             cls.status.in_(['submitted', 'verified'])
         )
         if branch_id:
-            result = result.filter(cls.branch_id == branch_id)
+            query = query.filter(cls.branch_id == branch_id)
 
-        row = result.first()
+        row = query.one()
 
         return {
-            'total_sales': float(row[0] or 0),
-            'cash_amount': float(row[1] or 0),
-            'card_amount': float(row[2] or 0),
-            'transfer_amount': float(row[3] or 0),
-            'total_difference': float(row[4] or 0),
-            'new_subscriptions': int(row[5] or 0),
-            'renewals': int(row[6] or 0)
+            'total_sales': float(row[0]),
+            'cash_amount': float(row[1]),
+            'card_amount': float(row[2]),
+            'transfer_amount': float(row[3]),
+            'total_difference': float(row[4]),
+            'new_subscriptions': int(row[5]),
+            'renewals': int(row[6])
         }
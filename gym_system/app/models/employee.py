@@ -1,6 +1,7 @@
 """Employee management models - rewards, deductions, and settings"""
 from datetime import datetime, date, time
 from app import db
+from sqlalchemy.exc import IntegrityError
 
 
 class EmployeeSettings(db.Model):
@@ -38,8 +39,13 @@ class EmployeeSettings(db.Model):
         settings = cls.query.filter_by(brand_id=brand_id).first()
         if not settings:
             settings = cls(brand_id=brand_id)
-            db.session.add(settings)
-            db.session.commit()
+            try:
+                with db.session.begin_nested():
+                    db.session.add(settings)
+                db.session.commit()
+            except IntegrityError:
+                # Another request created the settings in the meantime
+                settings = cls.query.filter_by(brand_id=brand_id).one()
         return settings
 
 
@@ -131,22 +137,24 @@ class EmployeeDeduction(db.Model):
     def __repr__(self):
         return f'<EmployeeDeduction {self.title} - {self.amount}>'
 
+    TYPE_TEXT = {
+        'manual': 'يدوي',
+        'late': 'تأخير',
+        'absence': 'غياب'
+    }
+
     @property
     def type_text(self):
         """Type in Arabic"""
-        type_map = {
-            'manual': 'يدوي',
-            'late': 'تأخير',
-            'absence': 'غياب'
-        }
-        return type_map.get(self.deduction_type, self.deduction_type)
+        return self.TYPE_TEXT.get(self.deduction_type, self.deduction_type)
+
+    TYPE_CLASS = {
+        'manual': 'secondary',
+        'late': 'warning',
+        'absence': 'danger'
+    }
 
     @property
     def type_class(self):
         """CSS class for type"""
-        type_classes = {
-            'manual': 'secondary',
-            'late': 'warning',
-            'absence': 'danger'
-        }
-        return type_classes.get(self.deduction_type, 'secondary')
+        return self.TYPE_CLASS.get(self.deduction_type, 'secondary')
@@ -57,32 +57,40 @@ class Income(db.Model):
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'))
 
     # Relationships
+    brand = db.relationship('Brand')
     service_type = db.relationship('ServiceType', backref='income_records')
 
+    # Indexes for faster queries
+    __table_args__ = (
+        db.Index('idx_income_brand_date', 'brand_id', 'date'),
+    )
+
     def __repr__(self):
         return f'<Income {self.amount} - {self.type}>'
 
+    TYPE_TEXT = {
+        'subscription': 'اشتراك',
+        'renewal': 'تجديد',
+        'freeze_fee': 'رسوم تجميد',
+        'gift_card': 'كرت إهداء',
+        'other': 'أخرى'
+    }
+
     @property
     def type_text(self):
         """Type in Arabic"""
-        type_map = {
-            'subscription': 'اشتراك',
-            'renewal': 'تجديد',
-            'freeze_fee': 'رسوم تجميد',
-            'gift_card': 'كرت إهداء',
-            'other': 'أخرى'
-        }
-        return type_map.get(self.type, self.type)
+        return self.TYPE_TEXT.get(self.type, self.type)
+
+    PAYMENT_METHOD_TEXT = {
+        'cash': 'نقدي',
+        'card': 'شبكة',
+        'transfer': 'حوالة'
+    }
 
     @property
     def payment_method_text(self):
         """Payment method in Arabic"""
-        method_map = {
-            'cash': 'نقدي',
-            'card': 'شبكة',
-            'transfer': 'حوالة'
-        }
-        return method_map.get(self.payment_method, self.payment_method)
+        return self.PAYMENT_METHOD_TEXT.get(self.payment_method, self.payment_method)
 
     @classmethod
     def get_by_payment_method(cls, brand_id, start_date, end_date):
@@ -100,12 +108,12 @@ class Income(db.Model):
     @classmethod
     def get_total_for_period(cls, brand_id, start_date, end_date):
         """Get total income for period"""
-        result = db.session.query(db.func.sum(cls.amount)).filter(
+        result = db.session.query(db.func.coalesce(db.func.sum(cls.amount), 0)).filter(
             cls.brand_id == brand_id,
             cls.date >= start_date,
             cls.date <= end_date
         ).scalar()
-        return float(result) if result else 0.0
+        return float(result)
 
 
 class Expense(db.Model):
@@ -134,38 +142,49 @@ class Expense(db.Model):
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'))
 
     # Relationships
+    brand = db.relationship('Brand')
     approver = db.relationship('User', foreign_keys=[approved_by], backref='approved_expenses')
     creator = db.relationship('User', foreign_keys=[created_by], backref='created_expenses')
 
+    # Indexes for faster queries
+    __table_args__ = (
+        db.Index('idx_expenses_brand_date', 'brand_id', 'date'),
+        # Partial index: only the few expenses awaiting approval
+        db.Index('idx_expenses_pending', 'brand_id', 'date',
+                 postgresql_where=db.text("status = 'pending'"),
+                 sqlite_where=db.text("status = 'pending'")),
+    )
+
     def __repr__(self):
         return f'<Expense {self.amount} - {self.category_name}>'
 
+    STATUS_TEXT = {
+        'pending': 'قيد الانتظار',
+        'approved': 'معتمد',
+        'rejected': 'مرفوض'
+    }
+
     @property
     def status_text(self):
         """Status in Arabic"""
-        status_map = {
-            'pending': 'قيد الانتظار',
-            'approved': 'معتمد',
-            'rejected': 'مرفوض'
-        }
-        return status_map.get(self.status, self.status)
+        return self.STATUS_TEXT.get(self.status, self.status)
+
+    STATUS_CLASS = {
+        'pending': 'warning',
+        'approved': 'success',
+        'rejected': 'danger'
+    }
 
     @property
     def status_class(self):
         """CSS class for status"""
-        class_map = {
-            'pending': 'warning',
-            'approved': 'success',
-            'rejected': 'danger'
-        }
-        return class_map.get(self.status, 'secondary')
+        return self.STATUS_CLASS.get(self.status, 'secondary')
 
     def approve(self, user_id):
         """Approve the expense"""
         self.status = 'approved'
         self.approved_by = user_id
         self.approved_at = datetime.utcnow()
-        db.session.commit()
 
     def reject(self, user_id, reason):
         """Reject the expense"""
@@ -173,12 +192,13 @@ class Expense(db.Model):
         self.approved_by = user_id
         self.approved_at = datetime.utcnow()
         self.rejection_reason = reason
-        db.session.commit()
 
     @classmethod
     def get_pending_approvals(cls, brand_id=None):
         """Get all expenses pending approval"""
-        query = cls.query.filter_by(status='pending')
+        query = cls.query.options(
+            db.selectinload(cls.creator), db.selectinload(cls.approver), db.selectinload(cls.category)
+        ).filter_by(status='pending')
         if brand_id:
             query = query.filter_by(brand_id=brand_id)
         return query.order_by(cls.date.desc()).all()
@@ -186,12 +206,12 @@ class Expense(db.Model):
     @classmethod
     def get_total_for_period(cls, brand_id, start_date, end_date):
         """Get total expenses for period"""
-        result = db.session.query(db.func.sum(cls.amount)).filter(
+        result = db.session.query(db.func.coalesce(db.func.sum(cls.amount), 0)).filter(
             cls.brand_id == brand_id,
             cls.date >= start_date,
             cls.date <= end_date
         ).scalar()
-        return float(result) if result else 0.0
+        return float(result)
 
     @classmethod
     def get_by_category(cls, brand_id, start_date, end_date):
@@ -240,35 +260,39 @@ class Salary(db.Model):
     def __repr__(self):
         return f'<Salary {self.user_id} - {self.month}/{self.year}>'
 
+    STATUS_TEXT = {
+        'pending': 'معلق',
+        'approved': 'معتمد',
+        'paid': 'مدفوع'
+    }
+
     @property
     def status_text(self):
         """Status in Arabic"""
-        status_map = {
-            'pending': 'معلق',
-            'approved': 'معتمد',
-            'paid': 'مدفوع'
-        }
-        return status_map.get(self.status, self.status)
+        return self.STATUS_TEXT.get(self.status, self.status)
+
+    STATUS_CLASS = {
+        'pending': 'warning',
+        'approved': 'info',
+        'paid': 'success'
+    }
 
     @property
     def status_class(self):
         """CSS class for status"""
-        class_map = {
-            'pending': 'warning',
-            'approved': 'info',
-            'paid': 'success'
-        }
-        return class_map.get(self.status, 'secondary')
+        return self.STATUS_CLASS.get(self.status, 'secondary')
+
+    MONTH_NAMES = (
+        '', 'يناير', 'فبراير', 'مارس', 'أبريل', 'مايو', 'يونيو',
+        'يوليو', 'أغسطس', 'سبتمبر', 'أكتوبر', 'نوفمبر', 'ديسمبر'
+    )
 
     @property
     def month_name(self):
         """Month name in Arabic"""
-        months = {
-            1: 'يناير', 2: 'فبراير', 3: 'مارس', 4: 'أبريل',
-            5: 'مايو', 6: 'يونيو', 7: 'يوليو', 8: 'أغسطس',
-            9: 'سبتمبر', 10: 'أكتوبر', 11: 'نوفمبر', 12: 'ديسمبر'
-        }
-        return months.get(self.month, str(self.month))
+        if self.month and 1 <= self.month <= 12:
+            return self.MONTH_NAMES[self.month]
+        return str(self.month)
 
 
 class Refund(db.Model):
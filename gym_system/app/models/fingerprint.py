@@ -1,5 +1,21 @@
+import threading
+import time
 from datetime import datetime, timedelta
 from app import db
+from sqlalchemy.exc import IntegrityError
+
+# Last sync time per brand, cached per process; dashboards poll the sync
+# status far more often than the bridge syncs. Invalidation only reaches the
+# process that logged the sync, so other workers may lag by up to the TTL.
+# The lock guards the dict across gthread worker threads.
+SYNC_STATUS_TTL = 30  # seconds
+_last_sync_cache = {}
+_last_sync_lock = threading.Lock()
+
+# Heartbeat/sync age thresholds
+BRIDGE_ONLINE_AGE = timedelta(minutes=2)
+BRIDGE_DELAYED_AGE = timedelta(minutes=10)
+SYNC_WARNING_AGE = timedelta(minutes=5)
 
 
 class BridgeStatus(db.Model):
@@ -29,6 +45,10 @@ class BridgeStatus(db.Model):
 
     brand = db.relationship('Brand', backref='bridge_status')
 
+    __table_args__ = (
+        db.UniqueConstraint('brand_id', 'computer_name', name='unique_bridge_computer'),
+    )
+
     def __repr__(self):
         return f'<BridgeStatus {self.computer_name}>'
 
@@ -39,26 +59,26 @@ class BridgeStatus(db.Model):
             return 'غير متصل'
 
         diff = datetime.utcnow() - self.last_heartbeat
-        if diff < timedelta(minutes=2):
+        if diff < BRIDGE_ONLINE_AGE:
             return 'متصل'
-        elif diff < timedelta(minutes=10):
+        elif diff < BRIDGE_DELAYED_AGE:
             return 'متأخر'
         else:
             return 'غير متصل'
 
+    STATUS_CLASS = {
+        'متصل': 'success',
+        'متأخر': 'warning'
+    }
+
     @property
     def status_class(self):
         """CSS class for status"""
-        status = self.status_text
-        if status == 'متصل':
-            return 'success'
-        elif status == 'متأخر':
-            return 'warning'
-        return 'danger'
+        return self.STATUS_CLASS.get(self.status_text, 'danger')
 
     @classmethod
     def get_or_create(cls, brand_id, computer_name):
-        """Get existing or create new bridge status"""
+        """Get existing or create new bridge status (the caller commits)"""
         status = cls.query.filter_by(
             brand_id=brand_id,
             computer_name=computer_name
@@ -66,7 +86,15 @@ class BridgeStatus(db.Model):
 
         if not status:
             status = cls(brand_id=brand_id, computer_name=computer_name)
-            db.session.add(status)
+            try:
+                with db.session.begin_nested():
+                    db.session.add(status)
+            except IntegrityError:
+                # Another heartbeat registered this computer in the meantime
+                status = cls.query.filter_by(
+                    brand_id=brand_id,
+                    computer_name=computer_name
+                ).one()
 
         return status
 
@@ -106,43 +134,53 @@ class DeviceCommand(db.Model):
     # Who created the command
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'))
 
+    # Partial index: the desktop software polls for pending commands
+    __table_args__ = (
+        db.Index('idx_device_commands_pending', 'brand_id', 'created_at',
+                 postgresql_where=db.text("status = 'pending'"),
+                 sqlite_where=db.text("status = 'pending'")),
+    )
+
     def __repr__(self):
         return f'<DeviceCommand {self.command_type} - {self.status}>'
 
+    STATUS_TEXT = {
+        'pending': 'قيد الانتظار',
+        'processing': 'جاري التنفيذ',
+        'completed': 'تم التنفيذ',
+        'failed': 'فشل'
+    }
+
     @property
     def status_text(self):
         """Status in Arabic"""
-        status_map = {
-            'pending': 'قيد الانتظار',
-            'processing': 'جاري التنفيذ',
-            'completed': 'تم التنفيذ',
-            'failed': 'فشل'
-        }
-        return status_map.get(self.status, self.status)
+        return self.STATUS_TEXT.get(self.status, self.status)
+
+    STATUS_CLASS = {
+        'pending': 'warning',
+        'processing': 'info',
+        'completed': 'success',
+        'failed': 'danger'
+    }
 
     @property
     def status_class(self):
         """CSS class for status"""
-        class_map = {
-            'pending': 'warning',
-            'processing': 'info',
-            'completed': 'success',
-            'failed': 'danger'
-        }
-        return class_map.get(self.status, 'secondary')
+        return self.STATUS_CLASS.get(self.status, 'secondary')
+
+    COMMAND_TYPE_TEXT = {
+        'block_member': 'حظر عضو',
+        'unblock_member': 'إلغاء حظر عضو',
+        'update_member': 'تحديث بيانات عضو',
+        'add_member': 'إضافة عضو جديد',
+        'delete_member': 'حذف عضو',
+        'update_end_date': 'تحديث تاريخ انتهاء الاشتراك'
+    }
 
     @property
     def command_type_text(self):
         """Command type in Arabic"""
-        type_map = {
-            'block_member': 'حظر عضو',
-            'unblock_member': 'إلغاء حظر عضو',
-            'update_member': 'تحديث بيانات عضو',
-            'add_member': 'إضافة عضو جديد',
-            'delete_member': 'حذف عضو',
-            'update_end_date': 'تحديث تاريخ انتهاء الاشتراك'
-        }
-        return type_map.get(self.command_type, self.command_type)
+        return self.COMMAND_TYPE_TEXT.get(self.command_type, self.command_type)
 
     @classmethod
     def get_pending_commands(cls, brand_id):
@@ -152,6 +190,17 @@ class DeviceCommand(db.Model):
             status='pending'
         ).order_by(cls.created_at.asc()).all()
 
+    @classmethod
+    def purge_executed(cls, older_than_days=30):
+        """Delete completed/failed commands executed more than N days ago"""
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        deleted = cls.query.filter(
+            cls.status.in_(['completed', 'failed']),
+            cls.executed_at < cutoff
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
+
 
 class FingerprintSyncLog(db.Model):
     """Fingerprint sync log records"""
@@ -172,28 +221,34 @@ class FingerprintSyncLog(db.Model):
 
     synced_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('idx_fingerprint_sync_brand_time', 'brand_id', 'synced_at'),
+    )
+
     def __repr__(self):
         return f'<FingerprintSyncLog {self.sync_type} - {self.synced_at}>'
 
+    STATUS_TEXT = {
+        'success': 'نجح',
+        'failed': 'فشل',
+        'partial': 'جزئي'
+    }
+
     @property
     def status_text(self):
         """Status in Arabic"""
-        status_map = {
-            'success': 'نجح',
-            'failed': 'فشل',
-            'partial': 'جزئي'
-        }
-        return status_map.get(self.status, self.status)
+        return self.STATUS_TEXT.get(self.status, self.status)
+
+    STATUS_CLASS = {
+        'success': 'success',
+        'failed': 'danger',
+        'partial': 'warning'
+    }
 
     @property
     def status_class(self):
         """CSS class for status"""
-        class_map = {
-            'success': 'success',
-            'failed': 'danger',
-            'partial': 'warning'
-        }
-        return class_map.get(self.status, 'secondary')
+        return self.STATUS_CLASS.get(self.status, 'secondary')
 
     @classmethod
     def get_last_sync(cls, brand_id):
@@ -202,22 +257,47 @@ class FingerprintSyncLog(db.Model):
             cls.synced_at.desc()
         ).first()
 
+    @classmethod
+    def get_last_sync_time(cls, brand_id):
+        """Get last sync time for brand, cached for SYNC_STATUS_TTL seconds"""
+        now = time.time()
+        with _last_sync_lock:
+            cached = _last_sync_cache.get(brand_id)
+        if cached and now - cached[0] < SYNC_STATUS_TTL:
+            return cached[1]
+
+        synced_at = db.session.query(cls.synced_at).filter_by(brand_id=brand_id).order_by(
+            cls.synced_at.desc()
+        ).limit(1).scalar()
+        with _last_sync_lock:
+            # Evict expired brands so the dict only holds recently polled ones
+            expired = [b for b, (loaded_at, _) in _last_sync_cache.items() if now - loaded_at >= SYNC_STATUS_TTL]
+            for stale_id in expired:
+                del _last_sync_cache[stale_id]
+            _last_sync_cache[brand_id] = (now, synced_at)
+        return synced_at
+
+    @classmethod
+    def invalidate_sync_status(cls, brand_id):
+        """Drop this process's cached last sync time after a new sync is logged"""
+        with _last_sync_lock:
+            _last_sync_cache.pop(brand_id, None)
+
     @classmethod
     def get_sync_status(cls, brand_id):
         """Get sync status info"""
-        last_sync = cls.get_last_sync(brand_id)
-        if not last_sync:
+        last_synced_at = cls.get_last_sync_time(brand_id)
+        if not last_synced_at:
             return {
                 'status': 'never',
                 'message': 'لم تتم المزامنة بعد',
                 'class': 'secondary'
             }
 
-        from datetime import datetime, timedelta
-        time_diff = datetime.utcnow() - last_sync.synced_at
-        minutes = time_diff.seconds // 60
+        time_diff = datetime.utcnow() - last_synced_at
+        minutes = int(time_diff.total_seconds() // 60)
 
-        if time_diff > timedelta(minutes=5):
+        if time_diff > SYNC_WARNING_AGE:
             return {
                 'status': 'warning',
                 'message': f'آخر مزامنة منذ {minutes} دقيقة',
@@ -1,8 +1,15 @@
 from datetime import datetime, date
+from decimal import Decimal
 from app import db
+from sqlalchemy.exc import IntegrityError
 import secrets
 import string
 
+# 36^8 possible codes; the unique index on code catches collisions and
+# add_with_unique_code retries with a fresh code
+CODE_CHARS = string.ascii_uppercase + string.digits
+CODE_ATTEMPTS = 5
+
 
 class GiftCard(db.Model):
     """Gift cards (كروت الإهداء)"""
@@ -56,13 +63,25 @@ class GiftCard(db.Model):
 
     @staticmethod
     def generate_code():
-        """Generate a unique gift card code"""
-        chars = string.ascii_uppercase + string.digits
-        while True:
-            code = 'GC-' + ''.join(secrets.choice(chars) for _ in range(8))
-            existing = GiftCard.query.filter_by(code=code).first()
-            if not existing:
-                return code
+        """Generate a random gift card code"""
+        # One urandom draw for all 8 characters; the modulo bias over 36 symbols is negligible
+        return 'GC-' + ''.join(CODE_CHARS[b % len(CODE_CHARS)] for b in secrets.token_bytes(8))
+
+    def add_with_unique_code(self, new_code=None):
+        """Add the card to the session, drawing a new code on a collision
+
+        Returns False if every attempt collided. The caller commits.
+        """
+        new_code = new_code or self.generate_code
+        for _ in range(CODE_ATTEMPTS):
+            try:
+                with db.session.begin_nested():
+                    db.session.add(self)
+                    db.session.flush()
+                return True
+            except IntegrityError:
+                self.code = new_code()
+        return False
 
     @property
     def is_valid(self):
@@ -71,38 +90,40 @@ class GiftCard(db.Model):
             return False
         if self.expires_at and self.expires_at < date.today():
             return False
-        if float(self.remaining_amount) <= 0:
+        if self.remaining_amount <= 0:
             return False
         return True
 
+    STATUS_ARABIC = {
+        'active': 'نشط',
+        'partially_used': 'مستخدم جزئياً',
+        'redeemed': 'مستخدم',
+        'expired': 'منتهي الصلاحية',
+        'cancelled': 'ملغي'
+    }
+
     @property
     def status_arabic(self):
         """Get status in Arabic"""
-        status_map = {
-            'active': 'نشط',
-            'partially_used': 'مستخدم جزئياً',
-            'redeemed': 'مستخدم',
-            'expired': 'منتهي الصلاحية',
-            'cancelled': 'ملغي'
-        }
-        return status_map.get(self.status, self.status)
+        return self.STATUS_ARABIC.get(self.status, self.status)
+
+    STATUS_CLASS = {
+        'active': 'success',
+        'partially_used': 'info',
+        'redeemed': 'secondary',
+        'expired': 'warning',
+        'cancelled': 'danger'
+    }
 
     @property
     def status_class(self):
         """Get CSS class for status"""
-        status_classes = {
-            'active': 'success',
-            'partially_used': 'info',
-            'redeemed': 'secondary',
-            'expired': 'warning',
-            'cancelled': 'danger'
-        }
-        return status_classes.get(self.status, 'secondary')
+        return self.STATUS_CLASS.get(self.status, 'secondary')
 
     @property
     def used_amount(self):
         """Get amount used from the gift card"""
-        return float(self.original_amount) - float(self.remaining_amount)
+        return self.original_amount - self.remaining_amount
 
     def redeem(self, amount, member_id, subscription_id=None):
         """
@@ -112,8 +133,10 @@ class GiftCard(db.Model):
         if not self.is_valid:
             return False, 'كرت الإهداء غير صالح للاستخدام', 0
 
-        amount = float(amount)
-        remaining = float(self.remaining_amount)
+        # JSON amounts arrive as int/float; keep the Numeric column in Decimal
+        if not isinstance(amount, Decimal):
+            amount = Decimal(str(amount))
+        remaining = self.remaining_amount
 
         if amount > remaining:
             amount = remaining  # Use only what's available
@@ -128,19 +151,16 @@ class GiftCard(db.Model):
         else:
             self.status = 'partially_used'
 
-        db.session.commit()
         return True, f'تم استخدام {amount} ر.س من كرت الإهداء', amount
 
     def cancel(self):
         """Cancel the gift card"""
         self.status = 'cancelled'
-        db.session.commit()
 
     def check_expiry(self):
         """Check and update expiry status"""
         if self.expires_at and self.expires_at < date.today() and self.status in ['active', 'partially_used']:
             self.status = 'expired'
-            db.session.commit()
 
     @classmethod
     def get_valid_by_code(cls, code):
@@ -174,25 +194,25 @@ class GiftCard(db.Model):
     @classmethod
     def get_stats(cls, brand_id=None):
         """Get gift card statistics"""
-        from sqlalchemy import func
+        from sqlalchemy import func, case
 
-        query = cls.query
+        used = cls.status.in_(['redeemed', 'partially_used'])
+        query = db.session.query(
+            func.count(cls.id),
+            func.coalesce(func.sum(case((cls.status.in_(['active', 'partially_used']), 1), else_=0)), 0),
+            func.coalesce(func.sum(case((cls.status == 'redeemed', 1), else_=0)), 0),
+            func.coalesce(func.sum(cls.original_amount), 0),
+            func.coalesce(func.sum(case((used, cls.original_amount - cls.remaining_amount), else_=0)), 0)
+        )
         if brand_id:
-            query = query.filter_by(brand_id=brand_id)
-
-        total = query.count()
-        active = query.filter(cls.status.in_(['active', 'partially_used'])).count()
-        redeemed = query.filter_by(status='redeemed').count()
+            query = query.filter(cls.brand_id == brand_id)
 
-        total_value = db.session.query(func.sum(cls.original_amount))
-        if brand_id:
-            total_value = total_value.filter(cls.brand_id == brand_id)
-        total_value = total_value.scalar() or 0
+        row = query.one()
 
         return {
-            'total': total,
-            'active': active,
-            'redeemed': redeemed,
-            'total_value': float(total_value),
-            'profit': cls.get_total_profit(brand_id)
+            'total': row[0],
+            'active': int(row[1]),
+            'redeemed': int(row[2]),
+            'total_value': float(row[3]),
+            'profit': float(row[4])
         }
@@ -61,6 +61,14 @@ class HealthReport(db.Model):
         else:  # female
             return round(base - 161, 0)
 
+    ACTIVITY_MULTIPLIERS = {
+        'sedentary': 1.2,
+        'light': 1.375,
+        'moderate': 1.55,
+        'active': 1.725,
+        'very_active': 1.9
+    }
+
     @classmethod
     def calculate_daily_calories(cls, bmr, activity_level='moderate'):
         """
@@ -74,14 +82,7 @@ class HealthReport(db.Model):
         if not bmr:
             return None
 
-        multipliers = {
-            'sedentary': 1.2,
-            'light': 1.375,
-            'moderate': 1.55,
-            'active': 1.725,
-            'very_active': 1.9
-        }
-        return round(bmr * multipliers.get(activity_level, 1.55), 0)
+        return round(bmr * cls.ACTIVITY_MULTIPLIERS.get(activity_level, 1.55), 0)
 
     @classmethod
     def calculate_ideal_weight(cls, height_cm, gender):
@@ -146,7 +147,6 @@ class HealthReport(db.Model):
         )
 
         db.session.add(report)
-        db.session.commit()
         return report
 
     @property
@@ -163,22 +163,24 @@ class HealthReport(db.Model):
         else:
             return 'سمنة'
 
+    STATUS_ARABIC = {
+        'needs_weight_loss': 'محتاج تخس',
+        'needs_weight_gain': 'محتاج تزود وزن',
+        'excellent': 'وضعك ممتاز'
+    }
+
     @property
     def status_arabic(self):
         """Get status in Arabic"""
-        status_map = {
-            'needs_weight_loss': 'محتاج تخس',
-            'needs_weight_gain': 'محتاج تزود وزن',
-            'excellent': 'وضعك ممتاز'
-        }
-        return status_map.get(self.status, 'غير محدد')
+        return self.STATUS_ARABIC.get(self.status, 'غير محدد')
+
+    STATUS_CLASS = {
+        'needs_weight_loss': 'warning',
+        'needs_weight_gain': 'info',
+        'excellent': 'success'
+    }
 
     @property
     def status_class(self):
         """Get CSS class for status"""
-        status_classes = {
-            'needs_weight_loss': 'warning',
-            'needs_weight_gain': 'info',
-            'excellent': 'success'
-        }
-        return status_classes.get(self.status, 'secondary')
+        return self.STATUS_CLASS.get(self.status, 'secondary')
@@ -47,9 +47,9 @@ class Member(db.Model):
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'))
 
     # Relationships
-    subscriptions = db.relationship('Subscription', backref='member', lazy='dynamic',
+    subscriptions = db.relationship('Subscription', backref='member',
                                    order_by='desc(Subscription.created_at)')
-    attendance = db.relationship('MemberAttendance', backref='member', lazy='dynamic',
+    attendance = db.relationship('MemberAttendance', backref='member',
                                 order_by='desc(MemberAttendance.check_in)')
 
     def __repr__(self):
@@ -58,12 +58,9 @@ class Member(db.Model):
     @property
     def active_subscription(self):
         """Get current active subscription"""
-        from .subscription import Subscription
-        return Subscription.query.filter(
-            Subscription.member_id == self.id,
-            Subscription.status == 'active',
-            Subscription.end_date >= date.today()
-        ).first()
+        today = date.today()
+        return next((s for s in self.subscriptions
+                     if s.status == 'active' and s.end_date >= today), None)
 
     @property
     def has_active_subscription(self):
@@ -80,7 +77,7 @@ class Member(db.Model):
             return 'نشط'
 
         # Check for expired
-        last_sub = self.subscriptions.first()
+        last_sub = self.subscriptions[0] if self.subscriptions else None
         if last_sub:
             if last_sub.status == 'expired' or last_sub.end_date < date.today():
                 return 'منتهي'
@@ -89,17 +86,16 @@ class Member(db.Model):
 
         return 'بدون اشتراك'
 
+    SUBSCRIPTION_STATUS_CLASS = {
+        'نشط': 'success',
+        'مجمد': 'warning',
+        'منتهي': 'danger'
+    }
+
     @property
     def subscription_status_class(self):
         """Get CSS class for subscription status"""
-        status = self.subscription_status
-        if status == 'نشط':
-            return 'success'
-        elif status == 'مجمد':
-            return 'warning'
-        elif status == 'منتهي':
-            return 'danger'
-        return 'secondary'
+        return self.SUBSCRIPTION_STATUS_CLASS.get(self.subscription_status, 'secondary')
 
     @property
     def days_remaining(self):
@@ -112,7 +108,10 @@ class Member(db.Model):
     @property
     def total_attendance_count(self):
         """Total attendance count"""
-        return self.attendance.count()
+        from .attendance import MemberAttendance
+        return db.session.query(db.func.count(MemberAttendance.id)).filter(
+            MemberAttendance.member_id == self.id
+        ).scalar()
 
     @property
     def needs_fingerprint_enrollment(self):
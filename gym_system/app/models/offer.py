@@ -2,6 +2,9 @@ from datetime import datetime, date
 from app import db
 from decimal import Decimal
 
+ZERO = Decimal('0')
+CENT = Decimal('0.01')
+
 
 class PromotionalOffer(db.Model):
     """Promotional offers/campaigns (العروض)"""
@@ -43,6 +46,13 @@ class PromotionalOffer(db.Model):
     applicable_service_type = db.relationship('ServiceType', backref='offers')
     applicable_plan = db.relationship('Plan', backref='offers')
 
+    # Indexes for faster queries; only active offers are looked up by date
+    __table_args__ = (
+        db.Index('idx_offers_active_brand_end', 'brand_id', 'end_date',
+                 postgresql_where=db.text('is_active = true'),
+                 sqlite_where=db.text('is_active = 1')),
+    )
+
     def __repr__(self):
         return f'<PromotionalOffer {self.name}>'
 
@@ -72,29 +82,31 @@ class PromotionalOffer(db.Model):
             return 'exhausted'
         return 'active'
 
+    STATUS_ARABIC = {
+        'active': 'نشط',
+        'inactive': 'غير نشط',
+        'upcoming': 'قادم',
+        'expired': 'منتهي',
+        'exhausted': 'مستنفد'
+    }
+
     @property
     def status_arabic(self):
         """Get status in Arabic"""
-        status_map = {
-            'active': 'نشط',
-            'inactive': 'غير نشط',
-            'upcoming': 'قادم',
-            'expired': 'منتهي',
-            'exhausted': 'مستنفد'
-        }
-        return status_map.get(self.status, self.status)
+        return self.STATUS_ARABIC.get(self.status, self.status)
+
+    STATUS_CLASS = {
+        'active': 'success',
+        'inactive': 'secondary',
+        'upcoming': 'info',
+        'expired': 'warning',
+        'exhausted': 'danger'
+    }
 
     @property
     def status_class(self):
         """Get CSS class for status"""
-        status_classes = {
-            'active': 'success',
-            'inactive': 'secondary',
-            'upcoming': 'info',
-            'expired': 'warning',
-            'exhausted': 'danger'
-        }
-        return status_classes.get(self.status, 'secondary')
+        return self.STATUS_CLASS.get(self.status, 'secondary')
 
     @property
     def discount_display(self):
@@ -115,17 +127,20 @@ class PromotionalOffer(db.Model):
         Calculate the discount amount for a given original price
         Returns the discount amount (not the final price)
         """
-        original = Decimal(str(original_amount))
+        if isinstance(original_amount, Decimal):
+            original = original_amount
+        else:
+            original = Decimal(str(original_amount))
 
         if self.min_subscription_amount and original < self.min_subscription_amount:
-            return Decimal('0')
+            return ZERO
 
         if self.discount_type == 'percentage':
             discount = original * (self.discount_value / 100)
         else:  # fixed_amount
             discount = min(self.discount_value, original)
 
-        return discount.quantize(Decimal('0.01'))
+        return discount.quantize(CENT)
 
     def can_apply(self, subscription_amount, service_type_id=None, plan_id=None):
         """
@@ -135,9 +150,12 @@ class PromotionalOffer(db.Model):
         if not self.is_valid:
             return False, 'العرض غير صالح حالياً'
 
-        # Check minimum amount
-        if self.min_subscription_amount and subscription_amount < float(self.min_subscription_amount):
-            return False, f'الحد الأدنى للعرض هو {self.min_subscription_amount} ر.س'
+        # Check minimum amount against the Numeric column directly
+        if self.min_subscription_amount:
+            if not isinstance(subscription_amount, Decimal):
+                subscription_amount = Decimal(str(subscription_amount))
+            if subscription_amount < self.min_subscription_amount:
+                return False, f'الحد الأدنى للعرض هو {self.min_subscription_amount} ر.س'
 
         # Check service type restriction
         if self.applicable_service_type_id and service_type_id != self.applicable_service_type_id:
@@ -150,9 +168,20 @@ class PromotionalOffer(db.Model):
         return True, 'يمكن تطبيق العرض'
 
     def apply(self):
-        """Increment usage count when offer is applied"""
-        self.current_uses += 1
-        db.session.commit()
+        """Increment usage count when offer is applied; False if no uses are left"""
+        # A single conditional UPDATE so concurrent redemptions can't exceed max_uses
+        current = db.func.coalesce(PromotionalOffer.current_uses, 0)
+        result = db.session.execute(
+            db.update(PromotionalOffer).where(
+                PromotionalOffer.id == self.id,
+                db.or_(
+                    PromotionalOffer.max_uses.is_(None),
+                    PromotionalOffer.max_uses == 0,
+                    current < PromotionalOffer.max_uses
+                )
+            ).values(current_uses=current + 1)
+        )
+        return result.rowcount > 0
 
     @classmethod
     def get_active_offers(cls, brand_id, service_type_id=None, plan_id=None):
@@ -199,17 +228,20 @@ class PromotionalOffer(db.Model):
     def get_offer_stats(cls, offer_id):
         """Get statistics for a specific offer"""
         from .subscription import Subscription
+        from sqlalchemy import func
 
         offer = cls.query.get(offer_id)
         if not offer:
             return None
 
-        # Get subscriptions using this offer
-        subs_with_offer = Subscription.query.filter_by(offer_id=offer_id)
-
-        total_uses = subs_with_offer.count()
-        total_discount_given = sum(float(s.offer_discount or 0) for s in subs_with_offer)
-        total_revenue = sum(float(s.paid_amount or 0) for s in subs_with_offer)
+        # Aggregate subscriptions using this offer in one row
+        total_uses, total_discount_given, total_revenue = db.session.query(
+            func.count(Subscription.id),
+            func.coalesce(func.sum(Subscription.offer_discount), 0),
+            func.coalesce(func.sum(Subscription.paid_amount), 0)
+        ).filter(Subscription.offer_id == offer_id).one()
+        total_discount_given = float(total_discount_given)
+        total_revenue = float(total_revenue)
 
         return {
             'offer': offer,
@@ -225,19 +257,28 @@ class PromotionalOffer(db.Model):
         from .subscription import Subscription
         from sqlalchemy import func
 
-        query = cls.query.filter_by(brand_id=brand_id)
+        # One grouped query for all offers instead of stats queries per offer
+        query = db.session.query(
+            cls,
+            func.count(Subscription.id),
+            func.coalesce(func.sum(Subscription.offer_discount), 0),
+            func.coalesce(func.sum(Subscription.paid_amount), 0)
+        ).outerjoin(Subscription, Subscription.offer_id == cls.id).filter(cls.brand_id == brand_id)
 
         if start_date:
             query = query.filter(cls.start_date >= start_date)
         if end_date:
             query = query.filter(cls.end_date <= end_date)
 
-        offers = query.all()
         report = []
-
-        for offer in offers:
-            stats = cls.get_offer_stats(offer.id)
-            if stats:
-                report.append(stats)
+        for offer, total_uses, total_discount_given, total_revenue in query.group_by(cls.id).all():
+            total_discount_given = float(total_discount_given)
+            report.append({
+                'offer': offer,
+                'total_uses': total_uses,
+                'total_discount_given': total_discount_given,
+                'total_revenue': float(total_revenue),
+                'average_discount': total_discount_given / total_uses if total_uses > 0 else 0
+            })
 
         return report
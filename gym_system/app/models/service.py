@@ -44,12 +44,15 @@ class ServiceType(db.Model):
     @classmethod
     def seed_defaults(cls, brand_id):
         """Seed default service types for a brand"""
-        for service_data in cls.get_default_services():
-            existing = cls.query.filter_by(
-                brand_id=brand_id,
-                name_en=service_data['name_en']
-            ).first()
-            if not existing:
-                service = cls(brand_id=brand_id, **service_data)
-                db.session.add(service)
+        defaults = cls.get_default_services()
+        # Look up all existing service types in one query
+        existing = {
+            row.name_en for row in cls.query.with_entities(cls.name_en).filter(
+                cls.brand_id == brand_id,
+                cls.name_en.in_([s['name_en'] for s in defaults])
+            )
+        }
+        db.session.bulk_save_objects([
+            cls(brand_id=brand_id, **s) for s in defaults if s['name_en'] not in existing
+        ])
         db.session.commit()
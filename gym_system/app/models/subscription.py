@@ -1,4 +1,5 @@
 from datetime import datetime, date, timedelta
+from sqlalchemy.ext.hybrid import hybrid_property
 from app import db
 
 
@@ -33,18 +34,17 @@ class Plan(db.Model):
     def __repr__(self):
         return f'<Plan {self.name}>'
 
+    DURATION_TEXT = {
+        30: 'شهر',
+        90: '3 شهور',
+        180: '6 شهور',
+        365: 'سنة'
+    }
+
     @property
     def duration_text(self):
         """Human readable duration"""
-        if self.duration_days == 30:
-            return 'شهر'
-        elif self.duration_days == 90:
-            return '3 شهور'
-        elif self.duration_days == 180:
-            return '6 شهور'
-        elif self.duration_days == 365:
-            return 'سنة'
-        return f'{self.duration_days} يوم'
+        return self.DURATION_TEXT.get(self.duration_days) or f'{self.duration_days} يوم'
 
 
 class Subscription(db.Model):
@@ -96,34 +96,48 @@ class Subscription(db.Model):
     stopper = db.relationship('User', foreign_keys=[stopped_by], backref='stopped_subscriptions')
 
     # Relationships
-    freezes = db.relationship('SubscriptionFreeze', backref='subscription', lazy='dynamic')
-    payments = db.relationship('SubscriptionPayment', backref='subscription', lazy='dynamic')
-    attendance = db.relationship('MemberAttendance', backref='subscription', lazy='dynamic')
+    freezes = db.relationship('SubscriptionFreeze', backref='subscription')
+    payments = db.relationship('SubscriptionPayment', backref='subscription')
+    attendance = db.relationship('MemberAttendance', backref='subscription')
+
+    # Indexes for faster queries
+    __table_args__ = (
+        db.Index('idx_subscriptions_brand_created', 'brand_id', 'created_at'),
+        db.Index('idx_subscriptions_member_status_end', 'member_id', 'status', 'end_date'),
+        db.Index('idx_subscriptions_brand_status_end', 'brand_id', 'status', 'end_date'),
+        db.Index('idx_subscriptions_offer', 'offer_id'),
+    )
 
     def __repr__(self):
         return f'<Subscription {self.id} - {self.member.name if self.member else "N/A"}>'
 
-    @property
+    @hybrid_property
     def is_active(self):
         """Check if subscription is active"""
         return self.status == 'active' and self.end_date >= date.today()
 
-    @property
+    @is_active.expression
+    def is_active(cls):
+        return db.and_(cls.status == 'active', cls.end_date >= date.today())
+
+    @hybrid_property
     def is_expired(self):
         """Check if subscription is expired"""
         return self.end_date < date.today()
 
+    @is_expired.expression
+    def is_expired(cls):
+        return cls.end_date < date.today()
+
     @property
     def days_remaining(self):
         """Days remaining"""
-        if self.end_date >= date.today():
-            return (self.end_date - date.today()).days
-        return 0
+        return max((self.end_date - date.today()).days, 0)
 
     @property
     def freeze_count(self):
         """Number of times frozen"""
-        return self.freezes.count()
+        return len(self.freezes)
 
     @property
     def can_freeze(self):
@@ -135,31 +149,35 @@ class Subscription(db.Model):
     @property
     def total_freeze_days(self):
         """Total days frozen"""
-        return sum(f.freeze_days for f in self.freezes.all())
+        return db.session.query(db.func.coalesce(db.func.sum(SubscriptionFreeze.freeze_days), 0)).filter(
+            SubscriptionFreeze.subscription_id == self.id
+        ).scalar()
+
+    STATUS_TEXT = {
+        'active': 'نشط',
+        'frozen': 'مجمد',
+        'expired': 'منتهي',
+        'cancelled': 'ملغي',
+        'stopped': 'موقوف'
+    }
 
     @property
     def status_text(self):
         """Status in Arabic"""
-        status_map = {
-            'active': 'نشط',
-            'frozen': 'مجمد',
-            'expired': 'منتهي',
-            'cancelled': 'ملغي',
-            'stopped': 'موقوف'
-        }
-        return status_map.get(self.status, self.status)
+        return self.STATUS_TEXT.get(self.status, self.status)
+
+    STATUS_CLASS = {
+        'active': 'success',
+        'frozen': 'warning',
+        'expired': 'danger',
+        'cancelled': 'secondary',
+        'stopped': 'dark'
+    }
 
     @property
     def status_class(self):
         """CSS class for status"""
-        class_map = {
-            'active': 'success',
-            'frozen': 'warning',
-            'expired': 'danger',
-            'cancelled': 'secondary',
-            'stopped': 'dark'
-        }
-        return class_map.get(self.status, 'secondary')
+        return self.STATUS_CLASS.get(self.status, 'secondary')
 
     def stop(self, reason, user_id):
         """Stop subscription with reason"""
@@ -167,15 +185,27 @@ class Subscription(db.Model):
         self.stop_reason = reason
         self.stopped_at = datetime.utcnow()
         self.stopped_by = user_id
-        db.session.commit()
 
     def check_and_update_status(self):
         """Check and update status if needed"""
         if self.status == 'active' and self.end_date < date.today():
             self.status = 'expired'
-            db.session.commit()
         return self.status
 
+    @classmethod
+    def expire_overdue(cls, brand_id=None):
+        """Mark all active subscriptions past their end date as expired"""
+        stmt = db.update(cls).where(
+            cls.status == 'active',
+            cls.end_date < date.today()
+        ).values(status='expired')
+        if brand_id:
+            stmt = stmt.where(cls.brand_id == brand_id)
+
+        result = db.session.execute(stmt)
+        db.session.commit()
+        return result.rowcount
+
 
 class SubscriptionFreeze(db.Model):
     """Subscription freeze records"""
@@ -196,6 +226,11 @@ class SubscriptionFreeze(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'))
 
+    # Indexes for faster queries
+    __table_args__ = (
+        db.Index('idx_subscription_freezes_subscription', 'subscription_id'),
+    )
+
     def __repr__(self):
         return f'<Freeze {self.freeze_start} - {self.freeze_end}>'
 
@@ -223,16 +258,17 @@ class RenewalRejection(db.Model):
     def __repr__(self):
         return f'<RenewalRejection {self.member_id} - {self.reason}>'
 
+    REASON_ARABIC = {
+        'price': 'السعر',
+        'time': 'الوقت',
+        'service': 'الخدمة',
+        'personal': 'شخصي'
+    }
+
     @property
     def reason_arabic(self):
         """Get reason in Arabic"""
-        reason_map = {
-            'price': 'السعر',
-            'time': 'الوقت',
-            'service': 'الخدمة',
-            'personal': 'شخصي'
-        }
-        return reason_map.get(self.reason, self.reason)
+        return self.REASON_ARABIC.get(self.reason, self.reason)
 
     @classmethod
     def get_rejection_stats(cls, brand_id, start_date=None, end_date=None):
@@ -279,16 +315,17 @@ class SubscriptionStop(db.Model):
     def __repr__(self):
         return f'<SubscriptionStop {self.subscription_id} - {self.reason_type}>'
 
+    REASON_TYPE_ARABIC = {
+        'temporary': 'مؤقت',
+        'permanent': 'دائم',
+        'financial': 'مالي',
+        'other': 'أخرى'
+    }
+
     @property
     def reason_type_arabic(self):
         """Get reason type in Arabic"""
-        reason_map = {
-            'temporary': 'مؤقت',
-            'permanent': 'دائم',
-            'financial': 'مالي',
-            'other': 'أخرى'
-        }
-        return reason_map.get(self.reason_type, self.reason_type)
+        return self.REASON_TYPE_ARABIC.get(self.reason_type, self.reason_type)
 
 
 class SubscriptionPayment(db.Model):
@@ -306,5 +343,10 @@ class SubscriptionPayment(db.Model):
     notes = db.Column(db.Text)
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'))
 
+    # Indexes for faster queries
+    __table_args__ = (
+        db.Index('idx_subscription_payments_brand_date', 'brand_id', 'payment_date'),
+    )
+
     def __repr__(self):
         return f'<Payment {self.amount}>'
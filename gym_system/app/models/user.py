@@ -1,4 +1,5 @@
 from datetime import datetime
+from functools import cached_property
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
 from app import db, login_manager
@@ -8,6 +9,15 @@ class Role(db.Model):
     """Role model - User roles"""
     __tablename__ = 'roles'
 
+    # Boolean permission columns, in declaration order
+    PERMISSION_FLAGS = (
+        'is_owner', 'can_view_all_brands', 'can_manage_members', 'can_manage_subscriptions',
+        'can_view_finance', 'can_manage_finance', 'can_view_reports', 'can_manage_attendance',
+        'can_view_complaints', 'can_manage_complaints', 'can_view_daily_closing',
+        'can_manage_daily_closing', 'can_manage_classes', 'can_approve_expenses',
+        'can_manage_offers', 'can_manage_gift_cards',
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(50), nullable=False)  # Arabic name
     name_en = db.Column(db.String(50), unique=True, nullable=False)  # English name for logic
@@ -39,6 +49,11 @@ class Role(db.Model):
     def __repr__(self):
         return f'<Role {self.name_en}>'
 
+    @cached_property
+    def permissions(self):
+        """Set of permission flags granted to this role (computed once per instance)"""
+        return frozenset(flag for flag in self.PERMISSION_FLAGS if getattr(self, flag))
+
     @property
     def is_brand_manager(self):
         return self.name_en == 'brand_manager'
@@ -130,7 +145,7 @@ class User(UserMixin, db.Model):
     # Permission shortcuts
     @property
     def is_owner(self):
-        return self.role.is_owner if self.role else False
+        return self.has_permission('is_owner')
 
     @property
     def is_brand_manager(self):
@@ -138,7 +153,7 @@ class User(UserMixin, db.Model):
 
     @property
     def can_view_all_brands(self):
-        return self.role.can_view_all_brands if self.role else False
+        return self.has_permission('can_view_all_brands')
 
     @property
     def can_manage_brands(self):
@@ -150,19 +165,23 @@ class User(UserMixin, db.Model):
 
     @property
     def can_manage_members(self):
-        return self.role.can_manage_members if self.role else False
+        return self.has_permission('can_manage_members')
 
     @property
     def can_manage_subscriptions(self):
-        return self.role.can_manage_subscriptions if self.role else False
+        return self.has_permission('can_manage_subscriptions')
 
     @property
     def can_manage_finance(self):
-        return self.role.can_manage_finance if self.role else False
+        return self.has_permission('can_manage_finance')
 
     @property
     def can_view_reports(self):
-        return self.role.can_view_reports if self.role else False
+        return self.has_permission('can_view_reports')
+
+    def has_permission(self, flag):
+        """Check a Role permission flag, e.g. has_permission('can_manage_members')"""
+        return flag in self.role.permissions if self.role else False
 
     def can_access_brand(self, brand_id):
         """Check if user can access a specific brand"""
@@ -182,5 +201,9 @@ class User(UserMixin, db.Model):
 
 @login_manager.user_loader
 def load_user(user_id):
-    """Load user for Flask-Login"""
-    return User.query.get(int(user_id))
+    """Load user for Flask-Login
+
+    Uses the identity-map fast path and loads the role in the same query,
+    since permission checks read it on nearly every request.
+    """
+    return db.session.get(User, int(user_id), options=[db.joinedload(User.role)])
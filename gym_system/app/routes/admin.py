@@ -11,7 +11,10 @@ from app.models.user import User, Role
 from app.models.subscription import Plan
 from app.models.service import ServiceType
 from app.utils.decorators import owner_required, brand_manager_required
-from app.utils.helpers import save_uploaded_file, delete_uploaded_file
+from app.utils.helpers import (
+    save_uploaded_file, delete_uploaded_file, invalidate_choices,
+    role_choices, brand_choices, service_type_choices
+)
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -90,7 +93,9 @@ class ServiceTypeForm(FlaskForm):
 @owner_required
 def brands_list():
     """List all brands"""
-    brands = Brand.query.order_by(Brand.created_at.desc()).all()
+    brands = Brand.query.options(
+        db.selectinload(Brand.branches)
+    ).order_by(Brand.created_at.desc()).all()
     return render_template('admin/brands/index.html', brands=brands)
 
 
@@ -128,6 +133,7 @@ def brands_create():
 
         db.session.add(brand)
         db.session.commit()
+        invalidate_choices()
 
         flash(f'تم إنشاء البراند "{brand.name}" بنجاح', 'success')
         return redirect(url_for('admin.brands_list'))
@@ -162,6 +168,7 @@ def brands_edit(brand_id):
                     brand.logo = logo_path
 
         db.session.commit()
+        invalidate_choices()
         flash('تم تحديث البراند بنجاح', 'success')
         return redirect(url_for('admin.brands_list'))
 
@@ -207,6 +214,7 @@ def branches_create(brand_id):
         )
         db.session.add(branch)
         db.session.commit()
+        invalidate_choices()
 
         flash('تم إنشاء الفرع بنجاح', 'success')
         return redirect(url_for('admin.branches_list', brand_id=brand_id))
@@ -239,11 +247,10 @@ def users_create():
     form = UserForm()
 
     # Populate choices - must be done before validate_on_submit
-    roles = Role.query.all()
-    form.role_id.choices = [(0, '-- اختر الدور --')] + [(r.id, r.name) for r in roles]
+    form.role_id.choices = [(0, '-- اختر الدور --')] + role_choices()
 
     if current_user.is_owner:
-        form.brand_id.choices = [(0, '-- بدون براند --')] + [(b.id, b.name) for b in Brand.query.filter_by(is_active=True).all()]
+        form.brand_id.choices = [(0, '-- بدون براند --')] + brand_choices()
     else:
         form.brand_id.choices = [(current_user.brand_id, current_user.brand.name)]
 
@@ -331,8 +338,7 @@ def plans_create():
     brand = Brand.query.get_or_404(brand_id)
 
     # Populate service type choices
-    service_types = ServiceType.query.filter_by(brand_id=brand_id, is_active=True).all()
-    form.service_type_id.choices = [(0, '-- بدون نوع خدمة محدد --')] + [(st.id, st.name) for st in service_types]
+    form.service_type_id.choices = [(0, '-- بدون نوع خدمة محدد --')] + service_type_choices(brand_id)
 
     if form.validate_on_submit():
         plan = Plan(
@@ -351,6 +357,7 @@ def plans_create():
         )
         db.session.add(plan)
         db.session.commit()
+        invalidate_choices()
 
         flash('تم إنشاء الباقة بنجاح', 'success')
         return redirect(url_for('admin.plans_list'))
@@ -373,8 +380,7 @@ def plans_edit(plan_id):
     form = PlanForm(obj=plan)
 
     # Populate service type choices
-    service_types = ServiceType.query.filter_by(brand_id=plan.brand_id, is_active=True).all()
-    form.service_type_id.choices = [(0, '-- بدون نوع خدمة محدد --')] + [(st.id, st.name) for st in service_types]
+    form.service_type_id.choices = [(0, '-- بدون نوع خدمة محدد --')] + service_type_choices(plan.brand_id)
 
     if form.validate_on_submit():
         plan.name = form.name.data
@@ -392,6 +398,7 @@ def plans_edit(plan_id):
         plan.requires_class_booking = form.requires_class_booking.data
 
         db.session.commit()
+        invalidate_choices()
         flash('تم تحديث الباقة بنجاح', 'success')
         return redirect(url_for('admin.plans_list'))
 
@@ -452,6 +459,7 @@ def service_types_create():
         )
         db.session.add(service_type)
         db.session.commit()
+        invalidate_choices()
 
         flash('تم إنشاء نوع الخدمة بنجاح', 'success')
         return redirect(url_for('admin.service_types_list'))
@@ -483,6 +491,7 @@ def service_types_edit(service_type_id):
         service_type.is_active = form.is_active.data
 
         db.session.commit()
+        invalidate_choices()
         flash('تم تحديث نوع الخدمة بنجاح', 'success')
         return redirect(url_for('admin.service_types_list'))
 
@@ -508,6 +517,7 @@ def service_types_delete(service_type_id):
 
     db.session.delete(service_type)
     db.session.commit()
+    invalidate_choices()
     flash('تم حذف نوع الخدمة بنجاح', 'success')
     return redirect(url_for('admin.service_types_list'))
 
@@ -525,5 +535,6 @@ def service_types_seed(brand_id):
         return redirect(url_for('admin.service_types_list'))
 
     ServiceType.seed_defaults(brand_id)
+    invalidate_choices()
     flash('تم إضافة أنواع الخدمات الافتراضية بنجاح', 'success')
     return redirect(url_for('admin.service_types_list'))
@@ -17,6 +17,7 @@ from app.models.classes import GymClass, ClassBooking
 from app.models.daily_closing import DailyClosing
 from app.models.giftcard import GiftCard
 from app.models.offer import PromotionalOffer
+from app.utils.helpers import invalidate_choices
 
 api_bp = Blueprint('api', __name__)
 
@@ -154,8 +155,7 @@ def sync_attendance():
             # Get active subscription
             subscription = Subscription.query.filter(
                 Subscription.member_id == member.id,
-                Subscription.status == 'active',
-                Subscription.end_date >= date.today()
+                Subscription.is_active
             ).first()
 
             # Check subscription status
@@ -218,11 +218,7 @@ def sync_attendance():
         except Exception as e:
             errors.append(str(e))
 
-    # Commit all records
-    if synced > 0:
-        db.session.commit()
-
-    # Log sync
+    # Log sync; committed together with the attendance records
     sync_log = FingerprintSyncLog(
         brand_id=brand_id,
         sync_type='attendance',
@@ -233,6 +229,7 @@ def sync_attendance():
     )
     db.session.add(sync_log)
     db.session.commit()
+    FingerprintSyncLog.invalidate_sync_status(brand_id)
 
     return jsonify({
         'success': True,
@@ -305,9 +302,7 @@ def mark_enrolled():
     if fingerprint_id:
         member.fingerprint_id = fingerprint_id
 
-    db.session.commit()
-
-    # Log
+    # Log; committed together with the enrollment update
     sync_log = FingerprintSyncLog(
         brand_id=member.brand_id,
         sync_type='enrollment',
@@ -316,6 +311,7 @@ def mark_enrolled():
     )
     db.session.add(sync_log)
     db.session.commit()
+    FingerprintSyncLog.invalidate_sync_status(member.brand_id)
 
     return jsonify({
         'success': True,
@@ -407,7 +403,7 @@ def get_bridge_status():
     if not brand_id:
         return jsonify({'error': 'brand_id is required'}), 400
 
-    bridges = BridgeStatus.query.filter_by(brand_id=brand_id).all()
+    bridges = BridgeStatus.query.filter_by(brand_id=brand_id).options(db.raiseload('*')).all()
 
     return jsonify({
         'bridges': [
@@ -730,6 +726,7 @@ def create_service_type():
     )
     db.session.add(service_type)
     db.session.commit()
+    invalidate_choices()
 
     return jsonify({
         'success': True,
@@ -768,6 +765,7 @@ def update_service_type(service_type_id):
         service_type.is_active = data['is_active']
 
     db.session.commit()
+    invalidate_choices()
 
     return jsonify({
         'success': True,
@@ -790,6 +788,7 @@ def delete_service_type(service_type_id):
 
     db.session.delete(service_type)
     db.session.commit()
+    invalidate_choices()
 
     return jsonify({
         'success': True,
@@ -865,6 +864,7 @@ def create_member_health_report(member_id):
         gender=data['gender'],
         created_by=data.get('created_by')
     )
+    db.session.commit()
 
     return jsonify({
         'success': True,
@@ -984,6 +984,40 @@ def track_complaint(tracking_token):
     })
 
 
+@api_bp.route('/complaints/open', methods=['GET'])
+@require_api_key
+def get_open_complaints():
+    """Get open complaints for a brand, newest first, paged by before_id"""
+    brand_id = request.args.get('brand_id', type=int)
+    branch_id = request.args.get('branch_id', type=int)
+    before_id = request.args.get('before_id', type=int)
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+
+    if not brand_id:
+        return jsonify({'error': 'brand_id is required'}), 400
+
+    complaints = Complaint.get_open_complaints(brand_id, branch_id, before_id=before_id, limit=limit)
+
+    return jsonify({
+        'success': True,
+        'complaints': [
+            {
+                'id': c.id,
+                'subject': c.subject,
+                'customer_name': c.customer_display_name,
+                'status': c.status,
+                'status_arabic': c.status_arabic,
+                'priority': c.priority,
+                'priority_arabic': c.priority_arabic,
+                'created_at': c.created_at.isoformat()
+            }
+            for c in complaints
+        ],
+        # Pass back as before_id to fetch the next (older) page
+        'next_before_id': complaints[-1].id if len(complaints) == limit else None
+    })
+
+
 @api_bp.route('/complaints/categories', methods=['GET'])
 def get_complaint_categories():
     """Get all complaint categories (public)"""
@@ -1025,7 +1059,11 @@ def get_classes():
     if service_type_id:
         query = query.filter_by(service_type_id=service_type_id)
 
-    classes = query.order_by(GymClass.day_of_week, GymClass.start_time).all()
+    # Preload the trainer; any other relationship access raises instead of
+    # silently querying once per class
+    classes = query.options(
+        db.joinedload(GymClass.trainer), db.raiseload('*')
+    ).order_by(GymClass.day_of_week, GymClass.start_time).all()
 
     return jsonify({
         'success': True,
@@ -1209,15 +1247,18 @@ def get_class_bookings(class_id):
     else:
         booking_date = date.today()
 
-    bookings = gym_class.get_bookings_for_date(booking_date)
+    bookings = ClassBooking.query.options(
+        db.joinedload(ClassBooking.member), db.raiseload('*')
+    ).filter_by(class_id=class_id, booking_date=booking_date).all()
+    booked = len([b for b in bookings if b.status in ['booked', 'attended']])
 
     return jsonify({
         'success': True,
         'class_id': class_id,
         'date': booking_date.isoformat(),
         'capacity': gym_class.capacity,
-        'booked': len([b for b in bookings if b.status in ['booked', 'attended']]),
-        'available': gym_class.get_available_spots(booking_date),
+        'booked': booked,
+        'available': max(0, gym_class.capacity - booked),
         'bookings': [
             {
                 'id': b.id,
@@ -1286,6 +1327,7 @@ def checkin_class_booking(booking_id):
     checked_in_by = data.get('checked_in_by')
 
     booking.check_in(checked_in_by)
+    db.session.commit()
 
     return jsonify({
         'success': True,
@@ -1410,6 +1452,7 @@ def submit_daily_closing(closing_id):
         explanation=data.get('difference_explanation'),
         user_id=data.get('submitted_by')
     )
+    db.session.commit()
 
     return jsonify({
         'success': True,
@@ -1435,6 +1478,7 @@ def verify_daily_closing(closing_id):
     user_id = data.get('verified_by')
 
     closing.verify(user_id, approve)
+    db.session.commit()
 
     return jsonify({
         'success': True,
@@ -1520,7 +1564,8 @@ def create_gift_card():
         expires_at=expires_at,
         created_by=data.get('created_by')
     )
-    db.session.add(card)
+    if not card.add_with_unique_code():
+        return jsonify({'error': 'Could not generate a unique gift card code, please retry'}), 500
     db.session.commit()
 
     return jsonify({
@@ -1584,9 +1629,11 @@ def redeem_gift_card(card_id):
     if not success:
         return jsonify({'error': message}), 400
 
+    db.session.commit()
+
     return jsonify({
         'success': True,
-        'amount_redeemed': amount_redeemed,
+        'amount_redeemed': float(amount_redeemed),
         'remaining_amount': float(card.remaining_amount),
         'message': message
     })
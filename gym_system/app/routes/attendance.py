@@ -26,11 +26,15 @@ def index():
     if current_user.can_view_all_brands:
         today_attendance = MemberAttendance.query.filter(
             db.func.date(MemberAttendance.check_in) == today
+        ).options(
+            db.joinedload(MemberAttendance.member), db.raiseload('*')
         ).order_by(MemberAttendance.check_in.desc()).all()
     elif current_user.brand_id:
         today_attendance = MemberAttendance.query.filter(
             MemberAttendance.brand_id == current_user.brand_id,
             db.func.date(MemberAttendance.check_in) == today
+        ).options(
+            db.joinedload(MemberAttendance.member), db.raiseload('*')
         ).order_by(MemberAttendance.check_in.desc()).all()
     else:
         today_attendance = []
@@ -213,7 +217,7 @@ def search_member():
     if not current_user.can_view_all_brands:
         query = query.filter(Member.brand_id == current_user.brand_id)
 
-    members = query.limit(10).all()
+    members = query.options(db.selectinload(Member.subscriptions), db.raiseload('*')).limit(10).all()
 
     results = []
     for m in members:
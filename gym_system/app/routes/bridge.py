@@ -27,7 +27,7 @@ def index():
     bridges = []
     sync_logs = []
     if brand_id:
-        bridges = BridgeStatus.query.filter_by(brand_id=brand_id).order_by(
+        bridges = BridgeStatus.query.filter_by(brand_id=brand_id).options(db.raiseload('*')).order_by(
             BridgeStatus.last_heartbeat.desc()
         ).all()
 
@@ -53,7 +53,7 @@ def refresh_status():
     if not brand_id:
         return jsonify({'error': 'brand_id required'}), 400
 
-    bridges = BridgeStatus.query.filter_by(brand_id=brand_id).all()
+    bridges = BridgeStatus.query.filter_by(brand_id=brand_id).options(db.raiseload('*')).all()
 
     return jsonify({
         'bridges': [
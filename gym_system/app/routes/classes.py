@@ -8,6 +8,7 @@ from datetime import datetime, date, timedelta
 
 from app import db
 from app.models import Brand, Branch, Member, User, ServiceType, GymClass, ClassBooking
+from app.utils.helpers import service_type_choices
 
 classes_bp = Blueprint('classes', __name__, url_prefix='/classes')
 
@@ -110,8 +111,7 @@ def create():
         brand = current_user.brand
 
     # Populate choices
-    service_types = ServiceType.query.filter_by(brand_id=brand_id, is_active=True).all()
-    form.service_type_id.choices = [(st.id, st.name) for st in service_types]
+    form.service_type_id.choices = service_type_choices(brand_id)
 
     trainers = User.query.filter_by(brand_id=brand_id, is_trainer=True, is_active=True).all()
     form.trainer_id.choices = [(0, '-- بدون مدرب --')] + [(t.id, t.name) for t in trainers]
@@ -156,8 +156,7 @@ def edit(class_id):
     form = GymClassForm(obj=gym_class)
 
     # Populate choices
-    service_types = ServiceType.query.filter_by(brand_id=gym_class.brand_id, is_active=True).all()
-    form.service_type_id.choices = [(st.id, st.name) for st in service_types]
+    form.service_type_id.choices = service_type_choices(gym_class.brand_id)
 
     trainers = User.query.filter_by(brand_id=gym_class.brand_id, is_trainer=True, is_active=True).all()
     form.trainer_id.choices = [(0, '-- بدون مدرب --')] + [(t.id, t.name) for t in trainers]
@@ -196,7 +195,8 @@ def delete(class_id):
         return redirect(url_for('classes.index'))
 
     # Check for future bookings
-    future_bookings = gym_class.bookings.filter(
+    future_bookings = ClassBooking.query.filter(
+        ClassBooking.class_id == gym_class.id,
         ClassBooking.booking_date >= date.today(),
         ClassBooking.status == 'booked'
     ).count()
@@ -287,6 +287,7 @@ def checkin(booking_id):
         return redirect(url_for('classes.index'))
 
     booking.check_in(current_user.id)
+    db.session.commit()
     flash('تم تسجيل الحضور', 'success')
 
     return redirect(url_for('classes.bookings',
@@ -306,6 +307,7 @@ def cancel_booking(booking_id):
         return redirect(url_for('classes.index'))
 
     booking.cancel()
+    db.session.commit()
     flash('تم إلغاء الحجز', 'success')
 
     return redirect(url_for('classes.bookings',
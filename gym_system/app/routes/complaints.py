@@ -8,6 +8,7 @@ from datetime import datetime
 
 from app import db, csrf
 from app.models import Brand, Branch, Member, Complaint, ComplaintCategory
+from app.utils.helpers import pagination_args
 
 complaints_bp = Blueprint('complaints', __name__, url_prefix='/complaints')
 
@@ -55,6 +56,8 @@ def index():
     # Filters
     status_filter = request.args.get('status', '')
     category_filter = request.args.get('category', type=int)
+    before_id = request.args.get('before_id', type=int)
+    _, per_page = pagination_args(request)
 
     query = Complaint.query
 
@@ -66,7 +69,11 @@ def index():
     if category_filter:
         query = query.filter_by(category_id=category_filter)
 
-    complaints = query.order_by(Complaint.created_at.desc()).all()
+    complaints = Complaint.keyset_page(query.options(
+        db.joinedload(Complaint.category), db.joinedload(Complaint.member), db.raiseload('*')
+    ), before_id, per_page)
+    # A full page means there may be older complaints after the last one
+    next_before_id = complaints[-1].id if len(complaints) == per_page else None
     categories = ComplaintCategory.query.filter_by(is_active=True).all()
 
     # Stats
@@ -84,6 +91,8 @@ def index():
                          pending_count=pending_count,
                          status_filter=status_filter,
                          category_filter=category_filter,
+                         before_id=before_id,
+                         next_before_id=next_before_id,
                          brands=brands)
 
 
@@ -166,6 +175,7 @@ def resolve(complaint_id):
     form = ResolveForm()
     if form.validate_on_submit():
         complaint.resolve(form.resolution.data, current_user.id)
+        db.session.commit()
         flash('تم حل الشكوى بنجاح', 'success')
 
     return redirect(url_for('complaints.view', complaint_id=complaint.id))
@@ -187,6 +197,7 @@ def close(complaint_id):
         return redirect(url_for('complaints.index'))
 
     complaint.close()
+    db.session.commit()
     flash('تم إغلاق الشكوى', 'success')
 
     return redirect(url_for('complaints.view', complaint_id=complaint.id))
@@ -97,6 +97,7 @@ def create():
             explanation=form.difference_explanation.data,
             user_id=current_user.id
         )
+        db.session.commit()
         flash('تم تسليم الإقفال اليومي بنجاح', 'success')
         return redirect(url_for('daily_closing.view', closing_id=closing.id))
 
@@ -134,6 +135,7 @@ def verify(closing_id):
 
     action = request.form.get('action', 'approve')
     closing.verify(current_user.id, approve=(action == 'approve'))
+    db.session.commit()
 
     if action == 'approve':
         flash('تم التحقق من الإقفال بنجاح', 'success')
@@ -445,14 +445,11 @@ def employee():
 
 def get_brand_stats(brand_id, start_date, end_date):
     """Get statistics for a brand"""
-    today = date.today()
-
     members = Member.query.filter_by(brand_id=brand_id, is_active=True).count()
 
     active_subscriptions = Subscription.query.filter(
         Subscription.brand_id == brand_id,
-        Subscription.status == 'active',
-        Subscription.end_date >= today
+        Subscription.is_active
     ).count()
 
     income = Income.get_total_for_period(brand_id, start_date, end_date)
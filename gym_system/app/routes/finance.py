@@ -84,7 +84,7 @@ def income_list():
             payment_stats[method] = float(amount or 0)
 
     # Pagination
-    income = query.order_by(Income.date.desc()).paginate(
+    income = query.options(db.selectinload(Income.brand)).order_by(Income.date.desc()).paginate(
         page=page, per_page=per_page, error_out=False
     )
 
@@ -148,7 +148,7 @@ def expenses():
     pending_count = Expense.query.filter(*base_filter, Expense.status == 'pending').count()
 
     # Pagination
-    expenses = query.order_by(Expense.date.desc()).paginate(
+    expenses = query.options(db.selectinload(Expense.brand)).order_by(Expense.date.desc()).paginate(
         page=page, per_page=per_page, error_out=False
     )
 
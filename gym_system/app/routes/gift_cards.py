@@ -19,6 +19,11 @@ class GiftCardForm(FlaskForm):
     expires_at = DateField('تاريخ الانتهاء', validators=[Optional()])
 
 
+def generate_card_code():
+    """Random 64-bit hex code for cards created from the dashboard"""
+    return secrets.token_hex(8).upper()
+
+
 @gift_cards_bp.route('/')
 @login_required
 def index():
@@ -50,7 +55,7 @@ def index():
     if status_filter:
         query = query.filter_by(status=status_filter)
 
-    gift_cards = query.order_by(GiftCard.created_at.desc()).all()
+    gift_cards = query.options(db.raiseload('*')).order_by(GiftCard.created_at.desc()).all()
 
     return render_template('gift_cards/index.html',
                          gift_cards=gift_cards,
@@ -81,23 +86,20 @@ def create():
         brand = current_user.brand
 
     if form.validate_on_submit():
-        # Generate unique code
-        code = secrets.token_hex(8).upper()
-        while GiftCard.query.filter_by(code=code).first():
-            code = secrets.token_hex(8).upper()
-
         gift_card = GiftCard(
             brand_id=brand_id,
-            code=code,
+            code=generate_card_code(),
             original_amount=form.original_amount.data,
             remaining_amount=form.original_amount.data,
             expires_at=form.expires_at.data,
             created_by=current_user.id
         )
-        db.session.add(gift_card)
+        if not gift_card.add_with_unique_code(generate_card_code):
+            flash('تعذر إنشاء كود فريد لكرت الإهداء، يرجى المحاولة مرة أخرى', 'danger')
+            return render_template('gift_cards/form.html', form=form, brand=brand)
         db.session.commit()
 
-        flash(f'تم إنشاء كرت الإهداء بنجاح - الكود: {code}', 'success')
+        flash(f'تم إنشاء كرت الإهداء بنجاح - الكود: {gift_card.code}', 'success')
         return redirect(url_for('gift_cards.view', gift_card_id=gift_card.id))
 
     # Default expiry: 1 year from now
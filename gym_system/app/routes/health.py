@@ -98,6 +98,7 @@ def create_report(member_id):
             gender=form.gender.data,
             created_by=current_user.id
         )
+        db.session.commit()
 
         flash('تم إنشاء التقرير الصحي بنجاح', 'success')
         return redirect(url_for('health.view_report', member_id=member.id))
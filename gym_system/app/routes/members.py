@@ -8,6 +8,7 @@ from app import db
 from app.models.company import Brand, Branch
 from app.models.member import Member
 from app.models.subscription import Subscription
+from app.models.attendance import MemberAttendance
 from app.models.health import HealthReport
 from app.models.complaint import Complaint
 from app.utils.decorators import members_required
@@ -70,7 +71,11 @@ def index():
         query = query.filter_by(is_active=False)
 
     # Pagination
-    members = query.order_by(Member.created_at.desc()).paginate(
+    members = query.options(
+        db.selectinload(Member.subscriptions).joinedload(Subscription.plan),
+        db.joinedload(Member.brand),
+        db.raiseload('*')
+    ).order_by(Member.created_at.desc()).paginate(
         page=page, per_page=per_page, error_out=False
     )
 
@@ -171,10 +176,12 @@ def view(member_id):
         return redirect(url_for('members.index'))
 
     # Get subscriptions
-    subscriptions = member.subscriptions.all()
+    subscriptions = member.subscriptions
 
     # Get attendance
-    attendance = member.attendance.limit(20).all()
+    attendance = MemberAttendance.query.filter_by(
+        member_id=member_id
+    ).order_by(MemberAttendance.check_in.desc()).limit(20).all()
 
     # Get health reports
     health_reports = HealthReport.query.filter_by(
@@ -275,7 +282,7 @@ def search():
             Member.name.ilike(f'%{q}%'),
             Member.phone.ilike(f'%{q}%')
         )
-    ).limit(10).all()
+    ).options(db.selectinload(Member.subscriptions), db.raiseload('*')).limit(10).all()
 
     results = [{
         'id': m.id,
@@ -119,8 +119,7 @@ def members():
         today = date.today()
         active_subs = Subscription.query.filter(
             Subscription.brand_id == brand.id,
-            Subscription.status == 'active',
-            Subscription.end_date >= today
+            Subscription.is_active
         ).count()
 
         # Expiring soon (7 days)
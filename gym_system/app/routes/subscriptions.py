@@ -113,7 +113,13 @@ def index():
         query = query.filter_by(status=status)
 
     # Pagination
-    subscriptions = query.order_by(Subscription.created_at.desc()).paginate(
+    subscriptions = query.options(
+        db.joinedload(Subscription.member),
+        db.joinedload(Subscription.plan),
+        db.joinedload(Subscription.brand),
+        db.selectinload(Subscription.freezes),
+        db.raiseload('*')
+    ).order_by(Subscription.created_at.desc()).paginate(
         page=page, per_page=per_page, error_out=False
     )
 
@@ -182,12 +188,13 @@ def create():
         # Apply promotional offer
         if form.offer_id.data and form.offer_id.data != 0:
             offer = PromotionalOffer.query.get(form.offer_id.data)
-            if offer and offer.can_use:
+            if offer and offer.is_valid and offer.apply():
                 if offer.discount_type == 'percentage':
                     offer_discount = float(plan.price) * (float(offer.discount_value) / 100)
                 else:
                     offer_discount = float(offer.discount_value)
-                offer.current_uses += 1
+            else:
+                offer = None
 
         # Apply gift card
         if form.gift_card_code.data:
@@ -292,6 +299,7 @@ def view(subscription_id):
 
     # Update status if needed
     subscription.check_and_update_status()
+    db.session.commit()
 
     return render_template('subscriptions/view.html', subscription=subscription)
 
@@ -521,6 +529,10 @@ def expiring():
         Subscription.status == 'active',
         Subscription.end_date >= today,
         Subscription.end_date <= end_date
+    ).options(
+        db.joinedload(Subscription.member),
+        db.joinedload(Subscription.plan),
+        db.raiseload('*')
     ).order_by(Subscription.end_date)
 
     subscriptions = query.paginate(page=page, per_page=per_page, error_out=False)
@@ -554,11 +566,8 @@ def stop(subscription_id):
     form = StopForm()
 
     if form.validate_on_submit():
-        subscription.status = 'stopped'
-        subscription.stop_reason = f"{form.reason.data}: {form.details.data}" if form.details.data else form.reason.data
-        subscription.stopped_at = datetime.utcnow()
-        subscription.stopped_by = current_user.id
-
+        reason = f"{form.reason.data}: {form.details.data}" if form.details.data else form.reason.data
+        subscription.stop(reason, current_user.id)
         db.session.commit()
 
         flash('تم إيقاف الاشتراك', 'success')
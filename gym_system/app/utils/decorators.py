@@ -90,7 +90,7 @@ def finance_required(f):
         if not current_user.is_authenticated:
             return redirect(url_for('auth.login', next=request.url))
 
-        if not current_user.can_manage_finance:
+        if not current_user.has_permission('can_manage_finance'):
             flash('ليس لديك صلاحية للوصول للمالية', 'danger')
             abort(403)
 
@@ -105,7 +105,7 @@ def members_required(f):
         if not current_user.is_authenticated:
             return redirect(url_for('auth.login', next=request.url))
 
-        if not current_user.can_manage_members:
+        if not current_user.has_permission('can_manage_members'):
             flash('ليس لديك صلاحية لإدارة الأعضاء', 'danger')
             abort(403)
 
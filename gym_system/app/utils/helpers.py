@@ -1,6 +1,8 @@
 import os
+import time
 import uuid
 from datetime import datetime, date
+from functools import lru_cache
 from flask import current_app
 from werkzeug.utils import secure_filename
 
@@ -112,14 +114,17 @@ def get_date_range(period='month'):
     return today, today
 
 
+MONTH_NAMES = (
+    '', 'يناير', 'فبراير', 'مارس', 'أبريل', 'مايو', 'يونيو',
+    'يوليو', 'أغسطس', 'سبتمبر', 'أكتوبر', 'نوفمبر', 'ديسمبر'
+)
+
+
 def get_month_name(month):
     """Get Arabic month name"""
-    months = {
-        1: 'يناير', 2: 'فبراير', 3: 'مارس', 4: 'أبريل',
-        5: 'مايو', 6: 'يونيو', 7: 'يوليو', 8: 'أغسطس',
-        9: 'سبتمبر', 10: 'أكتوبر', 11: 'نوفمبر', 12: 'ديسمبر'
-    }
-    return months.get(month, str(month))
+    if isinstance(month, int) and 1 <= month <= 12:
+        return MONTH_NAMES[month]
+    return str(month)
 
 
 def calculate_age(birth_date):
@@ -141,3 +146,61 @@ def pagination_args(request, default_per_page=20):
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', default_per_page, type=int)
     return page, per_page
+
+
+# ============== Cached select choices ==============
+# Choice lists for admin forms are cached per process for CHOICES_TTL seconds.
+# Admin mutations call invalidate_choices() so the next render in this process
+# reloads them; other workers pick up the change within CHOICES_TTL.
+
+CHOICES_TTL = 60  # seconds
+_choices_version = 0
+
+
+def invalidate_choices():
+    """Drop cached select choices after an admin change"""
+    global _choices_version
+    _choices_version += 1
+
+
+def _choices_cache_key():
+    return _choices_version, int(time.time() // CHOICES_TTL)
+
+
+@lru_cache(maxsize=64)
+def _role_choices(cache_key):
+    from app.models.user import Role
+    return tuple((r.id, r.name) for r in Role.query.with_entities(Role.id, Role.name))
+
+
+@lru_cache(maxsize=64)
+def _brand_choices(cache_key):
+    from app.models.company import Brand
+    return tuple(
+        (b.id, b.name) for b in Brand.query.with_entities(Brand.id, Brand.name).filter_by(is_active=True)
+    )
+
+
+@lru_cache(maxsize=64)
+def _service_type_choices(brand_id, cache_key):
+    from app.models.service import ServiceType
+    return tuple(
+        (st.id, st.name) for st in ServiceType.query.with_entities(ServiceType.id, ServiceType.name).filter_by(
+            brand_id=brand_id, is_active=True
+        )
+    )
+
+
+def role_choices():
+    """(id, name) choices for all roles"""
+    return list(_role_choices(_choices_cache_key()))
+
+
+def brand_choices():
+    """(id, name) choices for active brands"""
+    return list(_brand_choices(_choices_cache_key()))
+
+
+def service_type_choices(brand_id):
+    """(id, name) choices for a brand's active service types"""
+    return list(_service_type_choices(brand_id, _choices_cache_key()))
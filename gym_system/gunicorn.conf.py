@@ -0,0 +1,9 @@
+# Gunicorn configuration (picked up automatically from the working directory)
+import os
+
+# Threaded workers let one process overlap database waits across requests.
+# Keep WEB_CONCURRENCY * GUNICORN_THREADS within DB_POOL_SIZE + DB_MAX_OVERFLOW.
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = 60
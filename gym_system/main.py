@@ -62,8 +62,15 @@ def init_database():
             }),
         ]
 
+        # Look up all existing roles in one query
+        existing = {
+            row.name_en for row in Role.query.with_entities(Role.name_en).filter(
+                Role.name_en.in_([r[0] for r in roles_data])
+            )
+        }
+
         for name_en, name_ar, description, permissions in roles_data:
-            if not Role.query.filter_by(name_en=name_en).first():
+            if name_en not in existing:
                 role = Role(name=name_ar, name_en=name_en, description=description, **permissions)
                 db.session.add(role)
                 print(f'Created role: {name_ar}')
@@ -0,0 +1,174 @@
+"""Add indexes and constraints for hot queries
+
+Revision ID: 7c3e9a1d5b42
+Revises: 0f70844f6ff9
+Create Date: 2026-10-17 10:12:48.531904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3e9a1d5b42'
+down_revision = '0f70844f6ff9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep one bridge row per computer (latest heartbeat, then newest id)
+    # so the unique constraint can be created
+    op.execute(sa.text("""
+        DELETE FROM bridge_status
+        WHERE computer_name IS NOT NULL
+          AND EXISTS (
+            SELECT 1 FROM bridge_status AS newer
+            WHERE newer.brand_id = bridge_status.brand_id
+              AND newer.computer_name = bridge_status.computer_name
+              AND newer.id <> bridge_status.id
+              AND (
+                newer.last_heartbeat > bridge_status.last_heartbeat
+                OR (newer.last_heartbeat IS NOT NULL AND bridge_status.last_heartbeat IS NULL)
+                OR ((newer.last_heartbeat = bridge_status.last_heartbeat
+                     OR (newer.last_heartbeat IS NULL AND bridge_status.last_heartbeat IS NULL))
+                    AND newer.id > bridge_status.id)
+              )
+          )
+    """))
+
+    with op.batch_alter_table('bridge_status', schema=None) as batch_op:
+        batch_op.create_unique_constraint('unique_bridge_computer', ['brand_id', 'computer_name'])
+
+    with op.batch_alter_table('device_commands', schema=None) as batch_op:
+        batch_op.create_index('idx_device_commands_pending', ['brand_id', 'created_at'], unique=False,
+                              postgresql_where=sa.text("status = 'pending'"),
+                              sqlite_where=sa.text("status = 'pending'"))
+
+    with op.batch_alter_table('fingerprint_sync_logs', schema=None) as batch_op:
+        batch_op.create_index('idx_fingerprint_sync_brand_time', ['brand_id', 'synced_at'], unique=False)
+
+    # Brand-wide closings (branch_id IS NULL) slipped past unique_daily_closing.
+    # Drop duplicate pending ones; they are recalculated from transactions anyway
+    op.execute(sa.text("""
+        DELETE FROM daily_closings
+        WHERE branch_id IS NULL
+          AND COALESCE(status, 'pending') = 'pending'
+          AND EXISTS (
+            SELECT 1 FROM daily_closings AS other
+            WHERE other.brand_id = daily_closings.brand_id
+              AND other.closing_date = daily_closings.closing_date
+              AND other.branch_id IS NULL
+              AND other.id <> daily_closings.id
+              AND (COALESCE(other.status, 'pending') <> 'pending' OR other.id < daily_closings.id)
+          )
+    """))
+
+    with op.batch_alter_table('daily_closings', schema=None) as batch_op:
+        batch_op.create_index('unique_daily_closing_brand_wide', ['brand_id', 'closing_date'], unique=True,
+                              postgresql_where=sa.text('branch_id IS NULL'),
+                              sqlite_where=sa.text('branch_id IS NULL'))
+        batch_op.create_index('idx_daily_closing_submitted', ['brand_id', 'closing_date'], unique=False,
+                              postgresql_where=sa.text("status = 'submitted'"),
+                              sqlite_where=sa.text("status = 'submitted'"))
+        batch_op.create_index('idx_daily_closing_brand_status_date', ['brand_id', 'status', 'closing_date'], unique=False)
+
+    # Cancel duplicate active bookings (keep an attended one, then the oldest)
+    # so unique_active_booking can be created
+    op.execute(sa.text("""
+        UPDATE class_bookings
+        SET status = 'cancelled', cancelled_at = CURRENT_TIMESTAMP
+        WHERE status IN ('booked', 'attended')
+          AND EXISTS (
+            SELECT 1 FROM class_bookings AS other
+            WHERE other.class_id = class_bookings.class_id
+              AND other.member_id = class_bookings.member_id
+              AND other.booking_date = class_bookings.booking_date
+              AND other.id <> class_bookings.id
+              AND other.status IN ('booked', 'attended')
+              AND ((other.status = 'attended' AND class_bookings.status = 'booked')
+                   OR (other.status = class_bookings.status AND other.id < class_bookings.id))
+          )
+    """))
+
+    with op.batch_alter_table('class_bookings', schema=None) as batch_op:
+        batch_op.create_index('idx_booking_class_date_status', ['class_id', 'booking_date', 'status'], unique=False)
+        batch_op.create_index('idx_booking_member_date', ['member_id', 'booking_date'], unique=False)
+        batch_op.create_index('unique_active_booking', ['class_id', 'member_id', 'booking_date'], unique=True,
+                              postgresql_where=sa.text("status IN ('booked', 'attended')"),
+                              sqlite_where=sa.text("status IN ('booked', 'attended')"))
+
+    with op.batch_alter_table('expenses', schema=None) as batch_op:
+        batch_op.create_index('idx_expenses_pending', ['brand_id', 'date'], unique=False,
+                              postgresql_where=sa.text("status = 'pending'"),
+                              sqlite_where=sa.text("status = 'pending'"))
+        batch_op.create_index('idx_expenses_brand_date', ['brand_id', 'date'], unique=False)
+
+    with op.batch_alter_table('promotional_offers', schema=None) as batch_op:
+        batch_op.create_index('idx_offers_active_brand_end', ['brand_id', 'end_date'], unique=False,
+                              postgresql_where=sa.text('is_active = true'),
+                              sqlite_where=sa.text('is_active = 1'))
+
+    with op.batch_alter_table('subscriptions', schema=None) as batch_op:
+        batch_op.create_index('idx_subscriptions_brand_status_end', ['brand_id', 'status', 'end_date'], unique=False)
+        batch_op.create_index('idx_subscriptions_offer', ['offer_id'], unique=False)
+        batch_op.create_index('idx_subscriptions_brand_created', ['brand_id', 'created_at'], unique=False)
+        batch_op.create_index('idx_subscriptions_member_status_end', ['member_id', 'status', 'end_date'], unique=False)
+
+    with op.batch_alter_table('subscription_freezes', schema=None) as batch_op:
+        batch_op.create_index('idx_subscription_freezes_subscription', ['subscription_id'], unique=False)
+
+    with op.batch_alter_table('income', schema=None) as batch_op:
+        batch_op.create_index('idx_income_brand_date', ['brand_id', 'date'], unique=False)
+
+    with op.batch_alter_table('subscription_payments', schema=None) as batch_op:
+        batch_op.create_index('idx_subscription_payments_brand_date', ['brand_id', 'payment_date'], unique=False)
+
+    with op.batch_alter_table('complaints', schema=None) as batch_op:
+        batch_op.create_index('idx_complaints_open', ['brand_id', 'status', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('complaints', schema=None) as batch_op:
+        batch_op.drop_index('idx_complaints_open')
+
+    with op.batch_alter_table('subscription_payments', schema=None) as batch_op:
+        batch_op.drop_index('idx_subscription_payments_brand_date')
+
+    with op.batch_alter_table('income', schema=None) as batch_op:
+        batch_op.drop_index('idx_income_brand_date')
+
+    with op.batch_alter_table('subscription_freezes', schema=None) as batch_op:
+        batch_op.drop_index('idx_subscription_freezes_subscription')
+
+    with op.batch_alter_table('subscriptions', schema=None) as batch_op:
+        batch_op.drop_index('idx_subscriptions_member_status_end')
+        batch_op.drop_index('idx_subscriptions_brand_created')
+        batch_op.drop_index('idx_subscriptions_offer')
+        batch_op.drop_index('idx_subscriptions_brand_status_end')
+
+    with op.batch_alter_table('promotional_offers', schema=None) as batch_op:
+        batch_op.drop_index('idx_offers_active_brand_end')
+
+    with op.batch_alter_table('expenses', schema=None) as batch_op:
+        batch_op.drop_index('idx_expenses_brand_date')
+        batch_op.drop_index('idx_expenses_pending')
+
+    with op.batch_alter_table('class_bookings', schema=None) as batch_op:
+        batch_op.drop_index('unique_active_booking')
+        batch_op.drop_index('idx_booking_member_date')
+        batch_op.drop_index('idx_booking_class_date_status')
+
+    with op.batch_alter_table('daily_closings', schema=None) as batch_op:
+        batch_op.drop_index('idx_daily_closing_brand_status_date')
+        batch_op.drop_index('idx_daily_closing_submitted')
+        batch_op.drop_index('unique_daily_closing_brand_wide')
+
+    with op.batch_alter_table('fingerprint_sync_logs', schema=None) as batch_op:
+        batch_op.drop_index('idx_fingerprint_sync_brand_time')
+
+    with op.batch_alter_table('device_commands', schema=None) as batch_op:
+        batch_op.drop_index('idx_device_commands_pending')
+
+    with op.batch_alter_table('bridge_status', schema=None) as batch_op:
+        batch_op.drop_constraint('unique_bridge_computer', type_='unique')